@@ -1,8 +1,9 @@
 import configparser
-import datetime
+import functools
 import json
 import logging
 import os
+import time
 
 from biomero import SlurmClient
 from collections import defaultdict
@@ -11,38 +12,121 @@ from django.http import JsonResponse, HttpResponseBadRequest
 from django.views.decorators.http import require_http_methods
 from omeroweb.webclient.decorators import login_required
 
+from .analyzer_views import invalidate_workflow_caches
+from .utils import json_loads
+
 logger = logging.getLogger(__name__)
 
+# Last parsed BIOMERO config, keyed on the paths and (mtime, size) of the
+# config files, so unchanged files are not re-read on every GET
+_CONFIG_CACHE = {"signature": None, "config": None}
+
+
+def _config_signature(paths):
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:  # missing files are ok
+            signature.append((path, None))
+        else:
+            signature.append((path, st.st_mtime_ns, st.st_size))
+    return tuple(signature)
+
+
+def _read_biomero_config():
+    """
+    Read the BIOMERO config from the default locations as a dict.
+
+    The parsed result is reused until one of the files changes.
+    """
+    paths = [
+        os.path.expanduser(SlurmClient._DEFAULT_CONFIG_PATH_1),
+        os.path.expanduser(SlurmClient._DEFAULT_CONFIG_PATH_2),
+        os.path.expanduser(SlurmClient._DEFAULT_CONFIG_PATH_3),
+    ]
+    signature = _config_signature(paths)
+    if _CONFIG_CACHE["signature"] == signature:
+        return _CONFIG_CACHE["config"]
+
+    # Load the configuration file
+    configs = configparser.ConfigParser(allow_no_value=True)
+    # Loads from default locations and given location, missing files are ok
+    configs.read(paths)
+    # Convert configparser object to JSON-like dict
+    config_dict = {
+        section: dict(configs.items(section)) for section in configs.sections()
+    }
+    _CONFIG_CACHE["signature"] = signature
+    _CONFIG_CACHE["config"] = config_dict
+    return config_dict
+
+
+# Text of the config file as last read or written by a save, keyed on its
+# path and (mtime, size), so a save does not re-read an unchanged file
+_UPDATER_CACHE = {"signature": None, "text": None}
+
+
+def _load_config_updater(config_path):
+    """Return a ConfigUpdater for config_path (empty if the file is missing)."""
+    config = ConfigUpdater()
+    # Read the existing configuration if the file exists
+    if os.path.exists(config_path):
+        signature = _config_signature([config_path])
+        if _UPDATER_CACHE["signature"] != signature:
+            with open(config_path) as config_file:
+                _UPDATER_CACHE["text"] = config_file.read()
+            _UPDATER_CACHE["signature"] = signature
+        config.read_string(_UPDATER_CACHE["text"], source=config_path)
+    return config
+
+
+def _model_prefix(key):
+    """Model name of a MODELS key, e.g. "cellpose" for "cellpose_job_mem"."""
+    # Split the key on the known suffixes
+    for suffix in ("_repo", "_job"):
+        if suffix in key:
+            return key.split(suffix)[0]
+    return key
+
+
+def _generate_model_comment(key):
+    if key.endswith("_job"):
+        c = "# The jobscript in the 'slurm_script_repo'"
+    elif key.endswith("_repo"):
+        c = "# The (e.g. github) repository with the descriptor.json file"
+    else:
+        c = "# Adding or overriding job value for this workflow"
+    return c
+
+
+def admin_required(view):
+    """
+    Decorator for views taking conn: returns a 403 JsonResponse unless the
+    current user is an admin.
+    """
+
+    @functools.wraps(view)
+    def wrapped(request, *args, conn=None, **kwargs):
+        ctx = conn.getEventContext()
+        if not ctx.isAdmin:
+            logger.error(f"Unauthorized request for user {ctx.userId}:{ctx.userName}")
+            return JsonResponse({"error": "Unauthorized request"}, status=403)
+        return view(request, *args, conn=conn, **kwargs)
+
+    return wrapped
+
 
 @login_required()
 @require_http_methods(["GET", "POST"])
+@admin_required
 def admin_config(request, conn=None, **kwargs):
     """
     Read the biomero config
     """
     if request.method == "GET":
         try:
-            current_user = conn.getUser()
-            username = current_user.getName()
-            user_id = current_user.getId()
-            is_admin = conn.isAdmin()
-            if not is_admin:
-                logger.error(f"Unauthorized request for user {user_id}:{username}")
-                return JsonResponse({"error": "Unauthorized request"}, status=403)
-            # Load the configuration file
-            configs = configparser.ConfigParser(allow_no_value=True)
-            # Loads from default locations and given location, missing files are ok
-            configs.read(
-                [
-                    os.path.expanduser(SlurmClient._DEFAULT_CONFIG_PATH_1),
-                    os.path.expanduser(SlurmClient._DEFAULT_CONFIG_PATH_2),
-                    os.path.expanduser(SlurmClient._DEFAULT_CONFIG_PATH_3),
-                ]
-            )
-            # Convert configparser object to JSON-like dict
-            config_dict = {
-                section: dict(configs.items(section)) for section in configs.sections()
-            }
+            config_dict = _read_biomero_config()
 
             return JsonResponse({"config": config_dict})
         except Exception as e:
@@ -55,37 +139,20 @@ def admin_config(request, conn=None, **kwargs):
         """
         try:
             # Parse the incoming JSON payload
-            data = json.loads(request.body)
-            current_user = conn.getUser()
-            username = current_user.getName()
-            user_id = current_user.getId()
-            is_admin = conn.isAdmin()
-            if not is_admin:
-                logger.error(f"Unauthorized request for user {user_id}:{username}")
-                return JsonResponse({"error": "Unauthorized request"}, status=403)
+            data = json_loads(request.body)
+            ctx = conn.getEventContext()
+            username = ctx.userName
+            user_id = ctx.userId
 
             # Define the file path for saving the configuration
             config_path = os.path.expanduser(SlurmClient._DEFAULT_CONFIG_PATH_3)
 
-            # Create ConfigUpdater object
-            config = ConfigUpdater()
-
-            # Read the existing configuration if the file exists
-            if os.path.exists(config_path):
-                config.read(config_path)
+            # Create ConfigUpdater object from the existing configuration
+            config = _load_config_updater(config_path)
 
             # Extract the 'config' section from the incoming data
             config_data = data.get("config", {})
 
-            def generate_model_comment(key):
-                if key.endswith("_job"):
-                    c = "# The jobscript in the 'slurm_script_repo'"
-                elif key.endswith("_repo"):
-                    c = "# The (e.g. github) repository with the descriptor.json file"
-                else:
-                    c = "# Adding or overriding job value for this workflow"
-                return c
-
             # Update the config with new values
             for section, settingsd in config_data.items():
                 if not isinstance(settingsd, dict):
@@ -101,13 +168,7 @@ def admin_config(request, conn=None, **kwargs):
                     # Group keys by prefix (cellpose, stardist, etc.)
                     model_keys = defaultdict(list)
                     for key, value in settingsd.items():
-                        # Split the key on the known suffixes
-                        model_prefix = key
-                        for suffix in ["repo", "job"]:
-                            if f"_{suffix}" in key:
-                                model_prefix = key.split(f"_{suffix}")[0]
-                                break
-                        model_keys[model_prefix].append((key, value))
+                        model_keys[_model_prefix(key)].append((key, value))
 
                     # Sort the prefixes and insert the keys in the correct order
                     for model_prefix in sorted(model_keys.keys()):
@@ -131,7 +192,7 @@ def admin_config(request, conn=None, **kwargs):
                                     )
                                 else:
                                     # For new keys, add the key and a comment before it
-                                    model_comment = generate_model_comment(key)
+                                    model_comment = _generate_model_comment(key)
 
                                     if "job_" in key:
                                         (
@@ -152,21 +213,10 @@ def admin_config(request, conn=None, **kwargs):
                                             .option(key, value)
                                         )
 
-                    # Check for removing top-level keys and related keys
-                    for key in list(config[section].keys()):
-                        model_prefix = key
-                        for suffix in ["repo", "job"]:
-                            if f"_{suffix}" in key:
-                                model_prefix = key.split(f"_{suffix}")[0]
-                                break
-                        if model_prefix not in model_keys:
-                            # Remove the unwanted key or subsection
-                            del config[section][key]
-
+                    # Remove keys that aren't in the new settings; this also
+                    # covers all keys of models that were removed entirely
                     for key in list(config[section].keys()):
-                        if (
-                            key not in settingsd
-                        ):  # If key isn't in new settings, remove it
+                        if key not in settingsd:
                             del config[section][key]
 
                 elif section == "CONVERTERS":
@@ -183,7 +233,7 @@ def admin_config(request, conn=None, **kwargs):
                         config.set(section, key, value)
 
             # Prepare the update timestamp comment
-            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
             change_comment = f"Config automatically updated by {username} ({user_id}) via the web UI on {timestamp}"
             # Check if the changelog section exists, and create it if not
             if "changelog" not in config:
@@ -198,6 +248,9 @@ def admin_config(request, conn=None, **kwargs):
             # Save the updated configuration while preserving comments
             with open(config_path, "w") as config_file:
                 config.write(config_file)
+            _UPDATER_CACHE["signature"] = _config_signature([config_path])
+            _UPDATER_CACHE["text"] = str(config)
+            invalidate_workflow_caches()
 
             logger.info(f"Configuration saved successfully to {config_path}")
             return JsonResponse(
@@ -1,3 +1,4 @@
+import functools
 import jwt
 import logging
 import os
@@ -33,6 +34,22 @@ def check_base_directory():
 check_base_directory()
 
 
+# Metabase embed tokens are valid for 30 minutes. Tokens are reused within
+# 5 minute windows, so page reloads don't have to re-sign them.
+_TOKEN_TTL = 60 * 30
+_TOKEN_WINDOW = 60 * 5
+
+
+@functools.lru_cache(maxsize=256)
+def _sign_dashboard_token(secret_key, dashboard_id, param_key, param_value, window):
+    payload = {
+        "resource": {"dashboard": int(dashboard_id)},
+        "params": {param_key: [param_value]},
+        "exp": window * _TOKEN_WINDOW + _TOKEN_TTL,
+    }
+    return jwt.encode(payload, secret_key, algorithm="HS256")
+
+
 @login_required()
 @render_response()
 def biomero(request, conn=None, **kwargs):
@@ -57,21 +74,21 @@ def biomero(request, conn=None, **kwargs):
     user_id = current_user.getId()
     is_admin = conn.isAdmin()
 
-    payload_monitor_workflows = {
-        "resource": {"dashboard": int(metabase_dashboard_id_monitor_workflows)},
-        "params": {"user": [user_id]},
-        "exp": round(time.time()) + (60 * 30),
-    }
-    token_monitor_workflows = jwt.encode(
-        payload_monitor_workflows, metabase_secret_key, algorithm="HS256"
+    window = int(time.time()) // _TOKEN_WINDOW
+    token_monitor_workflows = _sign_dashboard_token(
+        metabase_secret_key,
+        metabase_dashboard_id_monitor_workflows,
+        "user",
+        user_id,
+        window,
+    )
+    token_imports = _sign_dashboard_token(
+        metabase_secret_key,
+        metabase_dashboard_id_imports,
+        "user_name",
+        username,
+        window,
     )
-
-    payload_imports = {
-        "resource": {"dashboard": int(metabase_dashboard_id_imports)},
-        "params": {"user_name": [username]},
-        "exp": round(time.time()) + (60 * 30),
-    }
-    token_imports = jwt.encode(payload_imports, metabase_secret_key, algorithm="HS256")
 
     context = {
         "metabase_site_url": metabase_site_url,
@@ -1,10 +1,14 @@
+import functools
 import json
 import os
 import logging
+import stat
+import threading
+import time
 import uuid
 
 from collections import defaultdict
-from django.http import HttpResponseBadRequest, JsonResponse
+from django.http import HttpResponseBadRequest
 from django.views.decorators.http import require_http_methods
 from omeroweb.webclient.decorators import login_required, render_response
 from biomero_importer.utils.ingest_tracker import (
@@ -23,12 +27,89 @@ from .settings import (
     PREPROCESSING_CONFIG,
     CONFIG_FILE_PATH,
 )
-from .utils import build_extra_params
+from .utils import (
+    FastJsonResponse,
+    ExtraParamsTemplate,
+    json_dumps_indented,
+    json_loads,
+)
 
 logger = logging.getLogger(__name__)
 
 
+# Set versions of the extension lists from settings, for cheap membership
+# checks while listing folders
+_SUPPORTED_EXTENSIONS = frozenset(SUPPORTED_FILE_EXTENSIONS)
+_NON_BROWSABLE_FOLDER_EXTENSIONS = frozenset(FOLDER_EXTENSIONS_NON_BROWSABLE)
+
+
+def _name_ext(name):
+    """
+    Lowercase extension of a bare file name (no directory part), the same as
+    os.path.splitext(name)[1].lower() but cheaper for per-entry use.
+    """
+    i = name.rfind(".")
+    # Leading dots don't start an extension (".bashrc", "..foo")
+    if i <= 0 or not name[:i].strip("."):
+        return ""
+    return name[i:].lower()
+
+
+# Destination types as sent by the frontend -> OMERO object type
+_DEST_TYPE_MAP = {
+    "screens": "Screen",
+    "Screen": "Screen",
+    "datasets": "Dataset",
+    "Dataset": "Dataset",
+}
+
 _INGEST_INITIALIZED = False
+_INGEST_INIT_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _import_root(base_dir):
+    """Canonical (symlink-free) import root, resolved once per base dir."""
+    return os.path.realpath(base_dir)
+
+
+def _is_within_import_root(rel_path):
+    """
+    Check that rel_path, relative to BASE_DIR, does not escape BASE_DIR.
+
+    This is a pure string check (normpath + commonpath) against the
+    canonical root, so it costs no syscalls per request.
+    """
+    root = _import_root(BASE_DIR)
+    target = os.path.normpath(os.path.join(root, rel_path))
+    return os.path.commonpath([target, root]) == root
+
+
+# Paths recently found missing, so clients retrying a bad item id don't
+# hit the filesystem each time. Kept short so new files show up quickly.
+_MISSING_PATHS = {}  # path -> time found missing
+_MISSING_PATHS_SIZE = 1024
+_MISSING_PATHS_TTL = 5  # seconds
+_MISSING_PATHS_LOCK = threading.Lock()
+
+
+def _stat_target(path):
+    """os.stat(path), or None if it doesn't exist (or recently didn't)."""
+    missing_since = _MISSING_PATHS.get(path)
+    if (
+        missing_since is not None
+        and time.monotonic() - missing_since < _MISSING_PATHS_TTL
+    ):
+        return None
+    try:
+        return os.stat(path)
+    except OSError:
+        with _MISSING_PATHS_LOCK:
+            _MISSING_PATHS.pop(path, None)
+            _MISSING_PATHS[path] = time.monotonic()
+            while len(_MISSING_PATHS) > _MISSING_PATHS_SIZE:
+                del _MISSING_PATHS[next(iter(_MISSING_PATHS))]
+        return None
 
 
 def initialize_biomero_importer():
@@ -45,25 +126,87 @@ def initialize_biomero_importer():
     if _INGEST_INITIALIZED:
         return
 
-    db_url = os.getenv("INGEST_TRACKING_DB_URL")
-    if not db_url:
-        logger.error("Environment variable 'INGEST_TRACKING_DB_URL' not set")
-        # do not set _INGEST_INITIALIZED so callers can try again later
-        return
+    # Serialize the first initialization between concurrent requests
+    with _INGEST_INIT_LOCK:
+        if _INGEST_INITIALIZED:
+            return
+
+        db_url = os.getenv("INGEST_TRACKING_DB_URL")
+        if not db_url:
+            logger.error("Environment variable 'INGEST_TRACKING_DB_URL' not set")
+            # do not set _INGEST_INITIALIZED so callers can try again later
+            return
+
+        config = {"ingest_tracking_db": db_url}
+
+        try:
+            if initialize_ingest_tracker(config):
+                logger.info("IngestTracker initialized successfully")
+                _INGEST_INITIALIZED = True
+            else:
+                logger.error("Failed to initialize IngestTracker")
+        except Exception as e:
+            logger.error(
+                "Unexpected error during IngestTracker initialization: %s",
+                e,
+                exc_info=True,
+            )
+
 
-    config = {"ingest_tracking_db": db_url}
+# Browser results keyed on (browser, path, mtime, size, options), so
+# browsing the same unchanged files again doesn't parse them again. Entries
+# also expire after a while, as multi-file formats (e.g. XLEF) can change
+# without the top-level file changing. Oldest entries are dropped first.
+_BROWSER_CACHE = {}  # key -> (time cached, metadata)
+_BROWSER_CACHE_SIZE = 512
+_BROWSER_CACHE_TTL = 300  # seconds
+_BROWSER_CACHE_LOCK = threading.Lock()
 
+
+def _browser_cache_key(browser, path, **kwargs):
+    """Cache key for browser(path, **kwargs), or None if path can't be stat'ed."""
     try:
-        if initialize_ingest_tracker(config):
-            logger.info("IngestTracker initialized successfully")
-            _INGEST_INITIALIZED = True
-        else:
-            logger.error("Failed to initialize IngestTracker")
-    except Exception as e:
-        logger.error(
-            f"Unexpected error during IngestTracker initialization: {e}",
-            exc__info=True,
-        )
+        st = os.stat(path)
+    except OSError:  # e.g. removed since it was listed
+        return None
+    return (browser, path, st.st_mtime_ns, st.st_size, tuple(sorted(kwargs.items())))
+
+
+def _get_cached_browser_result(key):
+    cached = _BROWSER_CACHE.get(key)
+    if cached is not None and time.monotonic() - cached[0] < _BROWSER_CACHE_TTL:
+        return cached[1]
+    return None
+
+
+def _cache_browser_result(key, metadata):
+    with _BROWSER_CACHE_LOCK:
+        _BROWSER_CACHE.pop(key, None)
+        _BROWSER_CACHE[key] = (time.monotonic(), metadata)
+        while len(_BROWSER_CACHE) > _BROWSER_CACHE_SIZE:
+            del _BROWSER_CACHE[next(iter(_BROWSER_CACHE))]
+
+
+def _browse_file(browser, path, **kwargs):
+    """browser(path, **kwargs), cached until the file changes."""
+    key = _browser_cache_key(browser, path, **kwargs)
+    if key is None:
+        # Let the browser report the missing file, and don't cache it
+        return browser(path, **kwargs)
+    metadata = _get_cached_browser_result(key)
+    if metadata is None:
+        metadata = browser(path, **kwargs)
+        _cache_browser_result(key, metadata)
+    # The cached dict is shared, so hand out a copy callers can modify
+    return dict(metadata) if isinstance(metadata, dict) else metadata
+
+
+def _read_file_browser_metadata(jobs):
+    """
+    Call browser(path) for each (browser, path) in jobs, in order, reusing
+    cached results for files that haven't changed.
+    """
+    return [_browse_file(browser, path) for browser, path in jobs]
 
 
 @login_required()
@@ -77,6 +220,13 @@ def get_folder_contents(request, conn=None, **kwargs):
     # Extract the folder ID from the request
     item_id = request.GET.get("item_id", None)
     is_folder = request.GET.get("is_folder", False)
+    # Metadata of browsable files in a folder listing is only read when
+    # asked for; clicking such a file fetches its contents (and metadata)
+    include_metadata = request.GET.get("include_metadata", "").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
 
     # Split the item ID to get the folder ID and item UUID
     item_uuid = None
@@ -85,36 +235,41 @@ def get_folder_contents(request, conn=None, **kwargs):
     else:
         item_path = item_id
 
-    logger.info(f"Connection: {conn.getUser().getName()}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Connection: %s", conn.getUser().getName())
+
+    # Don't allow browsing outside the import mount (e.g. "../" or "/etc")
+    if item_path is not None and not _is_within_import_root(item_path):
+        return HttpResponseBadRequest("Invalid folder ID or path does not exist.")
 
     # Determine the target path based on item_path or default to root folder
     target_path = BASE_DIR if item_path is None else os.path.join(BASE_DIR, item_path)
-    logger.info(f"Target folder: {target_path}")
+    logger.debug("Target folder: %s", target_path)
 
-    # Validate if the path exists
-    if not os.path.exists(target_path):
+    # Validate if the path exists; one stat() also tells us if it's a file
+    target_stat = _stat_target(target_path)
+    if target_stat is None:
         return HttpResponseBadRequest("Invalid folder ID or path does not exist.")
 
     # Get the contents of the folder/file
     contents = []
     clicked_item_metadata = None
-    logger.info(f"Item path: {target_path}, Item UUID: {item_uuid}")
+    logger.debug("Item path: %s, Item UUID: %s", target_path, item_uuid)
 
-    if os.path.isfile(target_path):
-        ext = os.path.splitext(target_path)[1]
+    if stat.S_ISREG(target_stat.st_mode):
+        ext = os.path.splitext(target_path)[1].lower()
         if ext in EXTENSION_TO_FILE_BROWSER:
+            browser = EXTENSION_TO_FILE_BROWSER[ext]
             if is_folder:
-                metadata = EXTENSION_TO_FILE_BROWSER[ext](
-                    target_path, folder_uuid=item_uuid
-                )
+                metadata = _browse_file(browser, target_path, folder_uuid=item_uuid)
             elif item_uuid:
-                metadata = EXTENSION_TO_FILE_BROWSER[ext](
-                    target_path, image_uuid=item_uuid
-                )
+                metadata = _browse_file(browser, target_path, image_uuid=item_uuid)
             else:
-                metadata = EXTENSION_TO_FILE_BROWSER[ext](target_path)
+                metadata = _browse_file(browser, target_path)
 
-            clicked_item_metadata = json.loads(metadata)
+            clicked_item_metadata = (
+                metadata if isinstance(metadata, dict) else json_loads(metadata)
+            )
 
             for item in clicked_item_metadata["children"]:
                 item_type = item.get("type", None)
@@ -128,7 +283,7 @@ def get_folder_contents(request, conn=None, **kwargs):
                     }
                 )
 
-        elif ext in SUPPORTED_FILE_EXTENSIONS:
+        elif ext in _SUPPORTED_EXTENSIONS:
             contents.append(
                 {
                     "name": os.path.basename(target_path),
@@ -152,7 +307,24 @@ def get_folder_contents(request, conn=None, **kwargs):
             }
         )
     else:  # Folder case
-        items = os.listdir(target_path)
+        # One pass over the directory: scandir gives us the entry type from
+        # the directory read itself (no stat() per entry), and each name's
+        # (lowercase) extension is split off once and indexed for the special
+        # patterns
+        entries = {}  # name -> (lowercase extension, is_dir, path)
+        names_by_lower = defaultdict(list)
+        names_by_lower_ext = defaultdict(list)
+        with os.scandir(target_path) as it:
+            for dir_entry in it:
+                name = dir_entry.name
+                ext = _name_ext(name)
+                entries[name] = (ext, dir_entry.is_dir(), dir_entry.path)
+                names_by_lower[name.lower()].append(name)
+                names_by_lower_ext[ext].append(name)
+        # Entry ids are relative to BASE_DIR; compute the folder part once
+        rel_dir = os.path.relpath(target_path, BASE_DIR)
+        if rel_dir == os.curdir:
+            rel_dir = ""
         # Simplified generic special handling (see settings.py docs):
         # One (and only one) special pattern match -> show just that file.
         # Conflicts / duplicates -> error. Otherwise show normal listing.
@@ -166,13 +338,9 @@ def get_folder_contents(request, conn=None, **kwargs):
         matched_files = []  # list of (pattern, filename)
         duplicate_errors = []
 
-        lower_items_map = {name.lower(): name for name in items}
-
         # Exact filename patterns (case-insensitive)
         for pat in special_exact:
-            matches = [
-                real for low, real in lower_items_map.items() if low == pat.lower()
-            ]
+            matches = names_by_lower.get(pat.lower(), [])
             if len(matches) > 1:
                 duplicate_errors.append(f"Multiple occurrences of '{pat}'")
             elif len(matches) == 1:
@@ -180,9 +348,7 @@ def get_folder_contents(request, conn=None, **kwargs):
 
         # Extension patterns
         for ext_pat in special_exts:
-            ext_matches = [
-                f for f in items if os.path.splitext(f)[1].lower() == ext_pat.lower()
-            ]
+            ext_matches = names_by_lower_ext.get(ext_pat.lower(), [])
             if len(ext_matches) > 1:
                 duplicate_errors.append(
                     f"Multiple '{ext_pat}' files: {', '.join(ext_matches)}"
@@ -209,19 +375,17 @@ def get_folder_contents(request, conn=None, **kwargs):
         if matched_files:
             # Exactly one pattern matched one file -> hide everything else
             _, special_filename = matched_files[0]
-            item_path_fs = os.path.join(target_path, special_filename)
-            ext = os.path.splitext(special_filename)[1].lower()
+            ext, is_dir, item_path_fs = entries[special_filename]
+            browser = EXTENSION_TO_FILE_BROWSER.get(ext)
             contents.append(
                 {
                     "name": special_filename,
-                    "is_folder": (
-                        os.path.isdir(item_path_fs) or ext in EXTENSION_TO_FILE_BROWSER
-                    )
-                    and ext not in FOLDER_EXTENSIONS_NON_BROWSABLE,
-                    "id": os.path.relpath(item_path_fs, BASE_DIR),
+                    "is_folder": (is_dir or browser is not None)
+                    and ext not in _NON_BROWSABLE_FOLDER_EXTENSIONS,
+                    "id": os.path.join(rel_dir, special_filename),
                     "metadata": (
-                        EXTENSION_TO_FILE_BROWSER[ext](item_path_fs)
-                        if ext in EXTENSION_TO_FILE_BROWSER
+                        _browse_file(browser, item_path_fs)
+                        if include_metadata and browser is not None
                         else None
                     ),
                     "source": "filesystem",
@@ -229,33 +393,42 @@ def get_folder_contents(request, conn=None, **kwargs):
             )
         else:
             # Normal directory listing (no specials)
-            for item in items:
-                item_path_fs = os.path.join(target_path, item)
-                ext = os.path.splitext(item)[1]
+            browser_jobs = []  # (entry, browser, path) to fill in metadata
+            for item, (ext, is_dir, item_path_fs) in entries.items():
+                # One lookup gives both "browsable?" and the browser itself
+                browser = EXTENSION_TO_FILE_BROWSER.get(ext)
                 is_folder = (
-                    os.path.isdir(item_path_fs) or ext in EXTENSION_TO_FILE_BROWSER
-                ) and ext not in FOLDER_EXTENSIONS_NON_BROWSABLE
-                metadata = None
-                if ext in EXTENSION_TO_FILE_BROWSER:
-                    metadata = EXTENSION_TO_FILE_BROWSER[ext](item_path_fs)
-                contents.append(
-                    {
-                        "name": item,
-                        "is_folder": is_folder,
-                        "id": os.path.relpath(item_path_fs, BASE_DIR),
-                        "metadata": metadata,
-                        "source": "filesystem",
-                    }
-                )
-
-    # Sort the contents by name, folders first
-    contents.sort(key=lambda x: (not x["is_folder"], x["name"].lower()))
+                    is_dir or browser is not None
+                ) and ext not in _NON_BROWSABLE_FOLDER_EXTENSIONS
+                entry = {
+                    "name": item,
+                    "is_folder": is_folder,
+                    "id": os.path.join(rel_dir, item),
+                    "metadata": None,
+                    "source": "filesystem",
+                }
+                if include_metadata and browser is not None:
+                    browser_jobs.append((entry, browser, item_path_fs))
+                contents.append(entry)
 
-    return {
-        "contents": contents,
-        "item_id": item_id,
-        "metadata": clicked_item_metadata,
-    }
+            all_metadata = _read_file_browser_metadata(
+                [(browser, path) for _, browser, path in browser_jobs]
+            )
+            for (entry, _, _), metadata in zip(browser_jobs, all_metadata):
+                entry["metadata"] = metadata
+
+    # Sort the contents by name, folders first. sort() computes the key once
+    # per entry; casefold() is the proper caseless comparison for Unicode
+    contents.sort(key=lambda x: (not x["is_folder"], x["name"].casefold()))
+    logger.info("Listed %d entries in %s", len(contents), target_path)
+
+    return FastJsonResponse(
+        {
+            "contents": contents,
+            "item_id": item_id,
+            "metadata": clicked_item_metadata,
+        }
+    )
 
 
 @login_required()
@@ -267,28 +440,29 @@ def import_selected(request, conn=None, **kwargs):
     initialize_biomero_importer()
 
     try:
-        data = json.loads(request.body)
+        data = json_loads(request.body)
         upload = data.get("upload", {})
         selected_items = upload.get("selectedLocal", [])
         selected_destinations = upload.get("selectedOmero", [])
         selected_group = upload.get("group")  # Get group from request
 
         if not selected_items:
-            return JsonResponse({"error": "No items selected"}, status=400)
+            return FastJsonResponse({"error": "No items selected"}, status=400)
         if not selected_destinations:
-            return JsonResponse({"error": "No destinations selected"}, status=400)
+            return FastJsonResponse({"error": "No destinations selected"}, status=400)
         if not selected_group:
-            return JsonResponse({"error": "No group specified"}, status=400)
+            return FastJsonResponse({"error": "No group specified"}, status=400)
 
         # Get the current user's information
         current_user = conn.getUser()
         username = current_user.getName()
         user_id = current_user.getId()
 
-        # Validate the group
-        available_groups = [g.getName() for g in conn.getGroupsMemberOf()]
-        if selected_group not in available_groups:
-            return JsonResponse(
+        # Validate the group; stop at the first matching membership
+        if not any(
+            g.getName() == selected_group for g in conn.getGroupsMemberOf()
+        ):
+            return FastJsonResponse(
                 {"error": f"User is not a member of group: {selected_group}"},
                 status=403,
             )
@@ -302,7 +476,7 @@ def import_selected(request, conn=None, **kwargs):
         # Call process_files with validated group
         process_files(selected_items, selected_destinations, selected_group, username)
 
-        return JsonResponse(
+        return FastJsonResponse(
             {
                 "status": "success",
                 "message": (
@@ -311,10 +485,66 @@ def import_selected(request, conn=None, **kwargs):
             }
         )
     except json.JSONDecodeError:
-        return JsonResponse({"error": "Invalid JSON data"}, status=400)
+        return FastJsonResponse({"error": "Invalid JSON data"}, status=400)
     except Exception as e:
-        logger.error(f"Import error: {str(e)}")
-        return JsonResponse({"error": str(e)}, status=500)
+        logger.error("Import error: %s", e)
+        return FastJsonResponse({"error": str(e)}, status=500)
+
+
+# Parsed contents of CONFIG_FILE_PATH, keyed on its path, mtime and size,
+# so GETs of the group mappings don't re-read an unchanged file
+_CONFIG_FILE_CACHE = {"signature": None, "data": None}
+_CONFIG_FILE_LOCK = threading.Lock()
+
+
+def _file_signature(path):
+    """(path, mtime, size) of a file, or None if it doesn't exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (path, st.st_mtime_ns, st.st_size)
+
+
+def _read_config_file():
+    """
+    Return the parsed importer config file as a dict ({} if it is missing
+    or not a JSON object). The result is cached until the file changes and
+    must not be modified by callers.
+    """
+    with _CONFIG_FILE_LOCK:
+        signature = _file_signature(CONFIG_FILE_PATH)
+        if _CONFIG_FILE_CACHE["signature"] != signature:
+            data = {}
+            if signature is not None:
+                with open(CONFIG_FILE_PATH, "rb") as f:
+                    data = json_loads(f.read()) or {}
+                if not isinstance(data, dict):
+                    data = {}
+            _CONFIG_FILE_CACHE["signature"] = signature
+            _CONFIG_FILE_CACHE["data"] = data
+        return _CONFIG_FILE_CACHE["data"]
+
+
+def _write_file_atomic(path, data):
+    """
+    Write bytes to path via a temporary file and os.replace, so readers see
+    either the old or the new file, never a partially written one.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
 
 
 @login_required()
@@ -324,50 +554,42 @@ def group_mappings(request, conn=None, **kwargs):
     try:
         if request.method == "GET":
             mappings = {}
-            if os.path.exists(CONFIG_FILE_PATH):
-                try:
-                    with open(CONFIG_FILE_PATH, "r") as f:
-                        data = json.load(f) or {}
-                    if isinstance(data, dict):
-                        gm = data.get("group_mappings")
-                        if isinstance(gm, dict):
-                            mappings = gm
-                except Exception:
-                    logger.warning(
-                        "Failed reading group mappings from %s",
-                        CONFIG_FILE_PATH,
-                        exc_info=True,
-                    )
-            return JsonResponse({"mappings": mappings})
+            try:
+                gm = _read_config_file().get("group_mappings")
+                if isinstance(gm, dict):
+                    mappings = gm
+            except Exception:
+                logger.warning(
+                    "Failed reading group mappings from %s",
+                    CONFIG_FILE_PATH,
+                    exc_info=True,
+                )
+            return FastJsonResponse({"mappings": mappings})
 
         # POST
         current_user = conn.getUser()
         username = current_user.getName()
         user_id = current_user.getId()
         if not conn.isAdmin():
-            return JsonResponse(
+            return FastJsonResponse(
                 {"error": "Only administrators can update group mappings"},
                 status=403,
             )
 
         try:
-            data = json.loads(request.body)
+            data = json_loads(request.body)
         except json.JSONDecodeError:
-            return JsonResponse({"error": "Invalid JSON data"}, status=400)
+            return FastJsonResponse({"error": "Invalid JSON data"}, status=400)
 
         mappings = data.get("mappings", {})
         if not isinstance(mappings, dict):
-            return JsonResponse({"error": "'mappings' must be an object"}, status=400)
+            return FastJsonResponse({"error": "'mappings' must be an object"}, status=400)
 
-        existing = {}
-        if os.path.exists(CONFIG_FILE_PATH):
-            try:
-                with open(CONFIG_FILE_PATH, "r") as f:
-                    existing = json.load(f) or {}
-                if not isinstance(existing, dict):
-                    existing = {}
-            except Exception:
-                existing = {}
+        try:
+            # Copy, the cached dict is shared
+            existing = dict(_read_config_file())
+        except Exception:
+            existing = {}
 
         existing["group_mappings"] = mappings
         # Ensure parent directory exists (handle cases where path includes
@@ -382,22 +604,24 @@ def group_mappings(request, conn=None, **kwargs):
                     config_dir,
                     e,
                 )
-                return JsonResponse(
+                return FastJsonResponse(
                     {"error": "Failed to prepare config directory"},
                     status=500,
                 )
         try:
-            with open(CONFIG_FILE_PATH, "w", encoding="utf-8") as f:
-                json.dump(existing, f, indent=2)
+            with _CONFIG_FILE_LOCK:
+                _write_file_atomic(CONFIG_FILE_PATH, json_dumps_indented(existing))
+                _CONFIG_FILE_CACHE["signature"] = _file_signature(CONFIG_FILE_PATH)
+                _CONFIG_FILE_CACHE["data"] = existing
         except Exception as e:
             logger.error("Failed writing group mappings: %s", e)
-            return JsonResponse({"error": f"Failed to save mappings, {e}"}, status=500)
+            return FastJsonResponse({"error": f"Failed to save mappings, {e}"}, status=500)
 
         logger.info("Group mappings updated by %s (ID: %s)", username, user_id)
-        return JsonResponse({"message": "Mappings saved successfully"})
+        return FastJsonResponse({"message": "Mappings saved successfully"})
     except Exception as e:
         logger.error("Error handling group mappings: %s", e)
-        return JsonResponse({"error": str(e)}, status=500)
+        return FastJsonResponse({"error": str(e)}, status=500)
 
 
 def process_files(selected_items, selected_destinations, group, username):
@@ -405,8 +629,18 @@ def process_files(selected_items, selected_destinations, group, username):
     Process selected files & destinations to create upload orders with
     appropriate preprocessing.
     """
-    # Group files by preprocessing config
-    files_by_preprocessing = defaultdict(list)
+    # Group files by destination and preprocessing config. Each group holds
+    # parallel lists of absolute paths and (optional) file UUIDs.
+    files_by_preprocessing = defaultdict(lambda: ([], []))
+
+    # Normalize the destination types once, not per item
+    destinations = []
+    for sample_parent_type, sample_parent_id in selected_destinations:
+        if sample_parent_type not in _DEST_TYPE_MAP:
+            raise ValueError(
+                f"Unknown type {sample_parent_type} for id " f"{sample_parent_id}"
+            )
+        destinations.append((_DEST_TYPE_MAP[sample_parent_type], sample_parent_id))
 
     for item in selected_items:
         # Support old string & new object format (backward compatible)
@@ -419,7 +653,10 @@ def process_files(selected_items, selected_destinations, group, username):
             local_path = item
             subfile_uuid = None
 
+        # Same for all destinations, so work these out once per item
         abs_path = os.path.abspath(os.path.join(BASE_DIR, local_path))
+        file_ext = os.path.splitext(local_path)[1].lower()
+        preprocessing_key = PREPROCESSING_EXTENSION_MAP.get(file_ext)
 
         logger.info(
             "Importing: %s to %s (UUID: %s)",
@@ -428,110 +665,101 @@ def process_files(selected_items, selected_destinations, group, username):
             subfile_uuid,
         )
 
-        for sample_parent_type, sample_parent_id in selected_destinations:
-            if sample_parent_type in ("screens", "Screen"):
-                sample_parent_type = "Screen"
-            elif sample_parent_type in ("datasets", "Dataset"):
-                sample_parent_type = "Dataset"
-            else:
-                raise ValueError(
-                    f"Unknown type {sample_parent_type} for id " f"{sample_parent_id}"
-                )
-
-            file_ext = os.path.splitext(local_path)[1].lower()
-            preprocessing_key = PREPROCESSING_EXTENSION_MAP.get(file_ext)
-
-            file_info = {
-                "path": abs_path,
-                "uuid": subfile_uuid,
-                "original_item": item,
-            }
-            files_by_preprocessing[
+        for sample_parent_type, sample_parent_id in destinations:
+            paths, file_uuids = files_by_preprocessing[
                 (
                     sample_parent_type,
                     sample_parent_id,
                     preprocessing_key,
                 )
-            ].append(file_info)
+            ]
+            paths.append(abs_path)
+            file_uuids.append(subfile_uuid)
 
-    # Now create orders for each group
+    # Build every order before logging any, so a bad group logs nothing
+    orders = []
     for (
         sample_parent_type,
         sample_parent_id,
         preprocessing_key,
-    ), file_infos in files_by_preprocessing.items():
-
-        # Extract just the file paths for the Files field
-        files = [file_info["path"] for file_info in file_infos]
+    ), (files, file_uuids) in files_by_preprocessing.items():
 
-        order_info = {
+        # Fields shared by every order of this group
+        base_order = {
             "Group": group,
             "Username": username,
             "DestinationID": sample_parent_id,
             "DestinationType": sample_parent_type,
-            "UUID": str(uuid.uuid4()),
-            "Files": files,
         }
 
         cfg = PREPROCESSING_CONFIG.get(preprocessing_key) if preprocessing_key else None
         if cfg:
-            order_info["preprocessing_container"] = cfg["container"]
-            order_info["preprocessing_inputfile"] = "{Files}"
-            order_info["preprocessing_outputfolder"] = "/data"
-            order_info["preprocessing_altoutputfolder"] = "/out"
-
-            template_extra = cfg.get("extra_params") or {}
-            uses_uuid_placeholder = any(
-                isinstance(v, str) and "{UUID}" in v for v in template_extra.values()
-            )
-
-            if uses_uuid_placeholder:
-                uuid_files = [f for f in file_infos if f["uuid"]]
-                non_uuid_files = [f for f in file_infos if not f["uuid"]]
+            base_order["preprocessing_container"] = cfg["container"]
+            base_order["preprocessing_inputfile"] = "{Files}"
+            base_order["preprocessing_outputfolder"] = "/data"
+            base_order["preprocessing_altoutputfolder"] = "/out"
+        # Scan the template for {UUID} once for all orders of this group
+        extra_params_template = ExtraParamsTemplate(
+            cfg.get("extra_params") if cfg else None
+        )
 
-                if not uuid_files:
-                    logger.warning(
-                        "Preprocessing key '%s' uses {UUID} but no UUIDs "
-                        "found in %d files.",
-                        preprocessing_key,
-                        len(file_infos),
+        if extra_params_template.uses_uuid:
+            # One order per file with a UUID; files without one are batched
+            batched_files = []
+            for path, file_uuid in zip(files, file_uuids):
+                if file_uuid:
+                    orders.append(
+                        _build_order(base_order, [path], extra_params_template, file_uuid)
                     )
-                    extra_params = build_extra_params(template_extra, None)
-                    if extra_params:
-                        order_info["extra_params"] = extra_params
                 else:
-                    for f in uuid_files:
-                        per_order = order_info.copy()
-                        per_order["Files"] = [f["path"]]
-                        per_order["UUID"] = str(uuid.uuid4())
-                        extra_params = build_extra_params(template_extra, f["uuid"])
-                        if extra_params:
-                            per_order["extra_params"] = extra_params
-                        create_upload_order(per_order)
-
-                    if non_uuid_files:
-                        grouped = order_info.copy()
-                        grouped["Files"] = [f["path"] for f in non_uuid_files]
-                        grouped["UUID"] = str(uuid.uuid4())
-                        extra_params = build_extra_params(template_extra, None)
-                        if extra_params:
-                            grouped["extra_params"] = extra_params
-                        create_upload_order(grouped)
-                    continue
-            else:
-                if any(f["uuid"] for f in file_infos):
-                    logger.info(
-                        "Ignoring %d provided file UUID(s) for "
-                        "preprocessing key '%s' without {UUID} placeholder.",
-                        sum(1 for f in file_infos if f["uuid"]),
-                        preprocessing_key,
-                    )
-                extra_params = build_extra_params(template_extra, None)
-                if extra_params:
-                    order_info["extra_params"] = extra_params
+                    batched_files.append(path)
+            if len(batched_files) == len(files):
+                logger.warning(
+                    "Preprocessing key '%s' uses {UUID} but no UUIDs "
+                    "found in %d files.",
+                    preprocessing_key,
+                    len(files),
+                )
+        else:
+            batched_files = files
+            n_uuids = sum(1 for file_uuid in file_uuids if file_uuid)
+            if cfg and n_uuids:
+                logger.info(
+                    "Ignoring %d provided file UUID(s) for "
+                    "preprocessing key '%s' without {UUID} placeholder.",
+                    n_uuids,
+                    preprocessing_key,
+                )
+
+        if batched_files:
+            orders.append(_build_order(base_order, batched_files, extra_params_template))
+
+    for order, order_uuid in zip(orders, _new_uuids(len(orders))):
+        order["UUID"] = order_uuid
 
-        # Create order (either no preprocessing or already enriched)
-        create_upload_order(order_info)
+    for order_dict in orders:
+        create_upload_order(order_dict)
+
+
+def _new_uuids(n):
+    """n random (version 4) UUID strings, from a single urandom() call."""
+    buf = os.urandom(16 * n)
+    return [
+        str(uuid.UUID(bytes=buf[i : i + 16], version=4))
+        for i in range(0, 16 * n, 16)
+    ]
+
+
+def _build_order(base_order, files, extra_params_template, file_uuid=None):
+    """
+    Build one upload order for files from the shared group fields. Its
+    "UUID" is filled in by the caller.
+    """
+    order = {**base_order, "Files": files}
+    extra_params = extra_params_template.render(file_uuid)
+    if extra_params:
+        order["extra_params"] = extra_params
+    return order
 
 
 def create_upload_order(order_dict):
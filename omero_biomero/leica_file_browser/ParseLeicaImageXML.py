@@ -1,4 +1,46 @@
-import xml.etree.ElementTree as ET
+# Excitation/emission wavelengths (nm) for the known widefield filter cubes
+_EX_EM_WAVELENGTHS = {
+    'DAPI': (355, 460),
+    'DAP': (355, 460),
+    'A': (355, 460),
+    'Blue': (355, 460),
+    'L5': (480, 527),
+    'I5': (480, 527),
+    'Green': (480, 527),
+    'FITC': (480, 527),
+    'N3': (545, 605),
+    'N2.1': (545, 605),
+    'TRITC': (545, 605),
+    '488': (488, 525),
+    '532': (532, 550),
+    '642': (642, 670),
+    'Red': (545, 605),
+    'Y3': (545, 605),
+    'I3': (545, 605),
+    'Y5': (590, 700),
+}
+
+# Conversion factors from Leica resolution units to micrometers
+_UNIT_FACTOR = {
+    'meter': 1e6,
+    'm': 1e6,
+    'centimeter': 1e4,
+    'inch': 25400,
+    'millimeter': 1e3,
+    'micrometer': 1,
+}
+
+# DimID -> (size key, resolution key, bytes increment key); tiles have no resolution
+_DIM_KEYS = {
+    1: ('xs', 'xres', 'xbytesinc'),
+    2: ('ys', 'yres', 'ybytesinc'),
+    3: ('zs', 'zres', 'zbytesinc'),
+    4: ('ts', 'tres', 'tbytesinc'),
+    10: ('tiles', None, 'tilesbytesinc'),
+}
+
+# (ILLEDActiveState<i>, ILLEDWavelength<i>) attribute names of the 8 AF 6000LX LED lines
+_ILLED_KEYS = tuple((f'ILLEDActiveState{i}', f'ILLEDWavelength{i}') for i in range(8))
 
 ###############################################################################
 # Shared metadata parser for images
@@ -13,10 +55,6 @@ def parse_image_xml(xml_element):
     Returns:
         dict: Dictionary with extracted metadata fields (e.g., xs, ys, zs, channels, isrgb, resolutions, LUTs, etc.).
     """
-
-    # with open(r"c:\xml.xml", "w") as f:
-    #     f.write(ET.tostring(xml_element).decode())
-
     metadata = {}
     metadata['UniqueID'] = None  # Initialize UniqueID
     metadata['ElementName'] = None
@@ -89,7 +127,11 @@ def parse_image_xml(xml_element):
         metadata['UniqueID'] = 'none (LOF)'
         metadata['ElementName'] = 'none (LOF)'
 
-    memory_block = xml_element.find('.//Memory/Block')
+    # Try the usual Element layout first; fall back to a deep search for
+    # other layouts (e.g. the LOF header root)
+    memory_block = xml_element.find('Memory/Block')
+    if memory_block is None:
+        memory_block = xml_element.find('.//Memory/Block')
     if memory_block is not None:
         block_file = memory_block.attrib.get('File')
         if block_file and block_file.lower().endswith('.lof'):
@@ -97,7 +139,9 @@ def parse_image_xml(xml_element):
         pass # Added pass to make block valid
 
     # Extract ImageDescription
-    image_description = xml_element.find('.//ImageDescription')
+    image_description = xml_element.find('Data/Image/ImageDescription')
+    if image_description is None:
+        image_description = xml_element.find('.//ImageDescription')
     if image_description is not None:
         # Extract Channels
         channels_element = image_description.find('Channels')
@@ -108,20 +152,29 @@ def parse_image_xml(xml_element):
                 channel_tag = channel_descriptions[0].attrib.get('ChannelTag')
                 if channel_tag and int(channel_tag) != 0:
                     metadata['isrgb'] = True
-            for channel_desc in channel_descriptions:
-                bytes_inc = channel_desc.attrib.get('BytesInc')
-                resolution = channel_desc.attrib.get('Resolution')
-                lut_name = channel_desc.attrib.get('LUTName')
-                metadata['channelbytesinc'].append(int(bytes_inc) if bytes_inc else None)
-                metadata['channelResolution'].append(int(resolution) if resolution else None)
-                metadata['lutname'].append(lut_name.lower() if lut_name else '')
+            # The channel count is known, so fill preallocated lists
+            channel_bytes_incs = metadata['channelbytesinc'] = [None] * metadata['channels']
+            channel_resolutions = metadata['channelResolution'] = [None] * metadata['channels']
+            lut_names = metadata['lutname'] = [''] * metadata['channels']
+            for i, channel_desc in enumerate(channel_descriptions):
+                channel_attrib = channel_desc.attrib
+                bytes_inc = channel_attrib.get('BytesInc')
+                resolution = channel_attrib.get('Resolution')
+                lut_name = channel_attrib.get('LUTName')
+                if bytes_inc:
+                    channel_bytes_incs[i] = int(bytes_inc)
+                if resolution:
+                    channel_resolutions[i] = int(resolution)
+                if lut_name:
+                    lut_names[i] = lut_name.lower()
         else:
             # Single channel, handle separately
             channel_desc = image_description.find('.//ChannelDescription')
             if channel_desc is not None:
-                bytes_inc = channel_desc.attrib.get('BytesInc')
-                resolution = channel_desc.attrib.get('Resolution')
-                lut_name = channel_desc.attrib.get('LUTName')
+                channel_attrib = channel_desc.attrib
+                bytes_inc = channel_attrib.get('BytesInc')
+                resolution = channel_attrib.get('Resolution')
+                lut_name = channel_attrib.get('LUTName')
                 metadata['channelbytesinc'].append(int(bytes_inc) if bytes_inc else None)
                 metadata['channelResolution'].append(int(resolution) if resolution else None)
                 metadata['lutname'].append(lut_name.lower() if lut_name else '')
@@ -133,11 +186,12 @@ def parse_image_xml(xml_element):
         if dimensions_element is not None:
             dim_descriptions = dimensions_element.findall('DimensionDescription')
             for dim_desc in dim_descriptions:
-                dim_id = int(dim_desc.attrib.get('DimID', '0'))
-                num_elements = int(dim_desc.attrib.get('NumberOfElements', '0'))
-                length = float(dim_desc.attrib.get('Length', '0'))
-                bytes_inc = int(dim_desc.attrib.get('BytesInc', '0'))
-                unit = dim_desc.attrib.get('Unit', '')
+                dim_attrib = dim_desc.attrib
+                dim_id = int(dim_attrib.get('DimID', '0'))
+                num_elements = int(dim_attrib.get('NumberOfElements', '0'))
+                length = float(dim_attrib.get('Length', '0'))
+                bytes_inc = int(dim_attrib.get('BytesInc', '0'))
+                unit = dim_attrib.get('Unit', '')
                 if unit:
                     metadata['resunit'] = unit
 
@@ -147,61 +201,53 @@ def parse_image_xml(xml_element):
                 else:
                     res = 0
 
-                if dim_id == 1:
-                    metadata['xs'] = num_elements
-                    metadata['xres'] = res
-                    metadata['xbytesinc'] = bytes_inc
-                elif dim_id == 2:
-                    metadata['ys'] = num_elements
-                    metadata['yres'] = res
-                    metadata['ybytesinc'] = bytes_inc
-                elif dim_id == 3:
-                    metadata['zs'] = num_elements
-                    metadata['zres'] = res
-                    metadata['zbytesinc'] = bytes_inc
-                elif dim_id == 4:
-                    metadata['ts'] = num_elements
-                    metadata['tres'] = res
-                    metadata['tbytesinc'] = bytes_inc
-                elif dim_id == 10:
-                    metadata['tiles'] = num_elements
-                    metadata['tilesbytesinc'] = bytes_inc
+                dim_keys = _DIM_KEYS.get(dim_id)
+                if dim_keys is not None:
+                    size_key, res_key, bytesinc_key = dim_keys
+                    metadata[size_key] = num_elements
+                    if res_key is not None:
+                        metadata[res_key] = res
+                    metadata[bytesinc_key] = bytes_inc
+
+        # Find the Attachments we need in one pass (first one of each name
+        # wins, as before) and stop as soon as all of them have been seen
+        attachments_by_name = dict.fromkeys(('ViewerScaling', 'HardwareSetting', 'TileScanInfo'))
+        missing = len(attachments_by_name)
+        for attachment in xml_element.iter('Attachment'):
+            name = attachment.attrib.get('Name')
+            if name in attachments_by_name and attachments_by_name[name] is None:
+                attachments_by_name[name] = attachment
+                missing -= 1
+                if not missing:
+                    break
 
         # Extract ViewerScaling (black and white values)
-        attachments = xml_element.findall('.//Attachment')
-        viewer_scaling = None
-        for attachment in attachments:
-            if attachment.attrib.get('Name') == 'ViewerScaling':
-                viewer_scaling = attachment
-                break
+        viewer_scaling = attachments_by_name.get('ViewerScaling')
         if viewer_scaling is not None:
             channel_scaling_infos = viewer_scaling.findall('ChannelScalingInfo')
             if channel_scaling_infos:
-                for csi in channel_scaling_infos:
-                    black_value = float(csi.attrib.get('BlackValue', '0'))
-                    white_value = float(csi.attrib.get('WhiteValue', '1'))
-                    metadata['blackvalue'].append(black_value)
-                    metadata['whitevalue'].append(white_value)
+                black_values = metadata['blackvalue'] = [0.0] * len(channel_scaling_infos)
+                white_values = metadata['whitevalue'] = [1.0] * len(channel_scaling_infos)
+                for i, csi in enumerate(channel_scaling_infos):
+                    csi_attrib = csi.attrib
+                    black_values[i] = float(csi_attrib.get('BlackValue', '0'))
+                    white_values[i] = float(csi_attrib.get('WhiteValue', '1'))
             else:
                 csi = viewer_scaling.find('ChannelScalingInfo')
                 if csi is not None:
-                    black_value = float(csi.attrib.get('BlackValue', '0'))
-                    white_value = float(csi.attrib.get('WhiteValue', '1'))
+                    csi_attrib = csi.attrib
+                    black_value = float(csi_attrib.get('BlackValue', '0'))
+                    white_value = float(csi_attrib.get('WhiteValue', '1'))
                     metadata['blackvalue'].append(black_value)
                     metadata['whitevalue'].append(white_value)
         else:
             # Default black/white
-            for _ in range(metadata['channels']):
-                metadata['blackvalue'].append(0)
-                metadata['whitevalue'].append(1)
+            metadata['blackvalue'] = [0] * metadata['channels']
+            metadata['whitevalue'] = [1] * metadata['channels']
 
 
         # Extract HardwareSetting
-        hardware_setting = None
-        for attachment in attachments:
-            if attachment.attrib.get('Name') == 'HardwareSetting':
-                hardware_setting = attachment
-                break
+        hardware_setting = attachments_by_name.get('HardwareSetting')
         if hardware_setting is not None:
             data_source_type_name = hardware_setting.attrib.get('DataSourceTypeName', '')
             metadata['mic_type2'] = data_source_type_name.lower()
@@ -404,38 +450,19 @@ def parse_image_xml(xml_element):
                                 xml_overlap_y_value = None # Attribute not found
                     wf_channel_infos = camera_setting.findall('WideFieldChannelInfo')
                     for wfci in wf_channel_infos:
-                        fluo_cube_name = wfci.attrib.get('FluoCubeName', '')
-                        contrast_method_name = wfci.attrib.get('ContrastingMethodName', '')
+                        wfci_attrib = wfci.attrib
+                        fluo_cube_name = wfci_attrib.get('FluoCubeName', '')
+                        contrast_method_name = wfci_attrib.get('ContrastingMethodName', '')
                         metadata['contrastmethod'].append(contrast_method_name)
                         ex_name = fluo_cube_name
                         if fluo_cube_name == 'QUAD-S':
-                            ex_name = wfci.attrib.get('FFW_Excitation1FilterName', '')
+                            ex_name = wfci_attrib.get('FFW_Excitation1FilterName', '')
                         elif fluo_cube_name == 'DA/FI/TX':
-                            ex_name = wfci.attrib.get('LUT', '')
+                            ex_name = wfci_attrib.get('LUT', '')
                         if fluo_cube_name!=ex_name or fluo_cube_name=='':
                             metadata['filterblock'].append(f"{fluo_cube_name}: {ex_name}")
 
-                        ex_em_wavelengths = {
-                            'DAPI': (355, 460),
-                            'DAP': (355, 460),
-                            'A': (355, 460),
-                            'Blue': (355, 460),
-                            'L5': (480, 527),
-                            'I5': (480, 527),
-                            'Green': (480, 527),
-                            'FITC': (480, 527),
-                            'N3': (545, 605),
-                            'N2.1': (545, 605),
-                            'TRITC': (545, 605),
-                            '488': (488, 525),
-                            '532': (532, 550),
-                            '642': (642, 670),
-                            'Red': (545, 605),
-                            'Y3': (545, 605),
-                            'I3': (545, 605),
-                            'Y5': (590, 700),
-                        }
-                        ex_em = ex_em_wavelengths.get(ex_name, (0, 0))
+                        ex_em = _EX_EM_WAVELENGTHS.get(ex_name, (0, 0))
                         metadata['excitation'].append(ex_em[0])
                         metadata['emission'].append(ex_em[1])
             else:
@@ -447,25 +474,22 @@ def parse_image_xml(xml_element):
 
 
         # Extract TileScanInfo
-        tile_scan_info = None
-        for attachment in attachments:
-            if attachment.attrib.get('Name') == 'TileScanInfo':
-                tile_scan_info = attachment
-                break
+        tile_scan_info = attachments_by_name.get('TileScanInfo')
         if tile_scan_info is not None:
             metadata['tilescan_flipx'] = int(tile_scan_info.attrib.get('FlipX', '0'))
             metadata['tilescan_flipy'] = int(tile_scan_info.attrib.get('FlipY', '0'))
             metadata['tilescan_swapxy'] = int(tile_scan_info.attrib.get('SwapXY', '0'))
             tiles = tile_scan_info.findall('Tile')
+            tile_positions = metadata['tile_positions'] = [None] * len(tiles)
             for i, tile in enumerate(tiles):
-                tile_info = {
+                tile_attrib = tile.attrib
+                tile_positions[i] = {
                     'num': i + 1,
-                    'FieldX': int(tile.attrib.get('FieldX', '0')),
-                    'FieldY': int(tile.attrib.get('FieldY', '0')),
-                    'PosX': float(tile.attrib.get('PosX', '0')),
-                    'PosY': float(tile.attrib.get('PosY', '0')),
+                    'FieldX': int(tile_attrib.get('FieldX', '0')),
+                    'FieldY': int(tile_attrib.get('FieldY', '0')),
+                    'PosX': float(tile_attrib.get('PosX', '0')),
+                    'PosY': float(tile_attrib.get('PosY', '0')),
                 }
-                metadata['tile_positions'].append(tile_info)            
 
         # Handle STELLARIS or AF 6000LX (Thunder) - Check if filterblock needs adjustment based on confocal logic
         if hardware_setting is not None:
@@ -476,9 +500,8 @@ def parse_image_xml(xml_element):
             # Decide if this STELLARIS-specific logic is still needed or redundant.
             # Keeping it for now, might need review based on STELLARIS XML examples.
             if 'STELLARIS' in system_type_name and not metadata['filterblock']: # Only run if confocal didn't populate it
-                channels_element = image_description.find('Channels')
+                # Reuse the Channels found above instead of searching again
                 if channels_element is not None:
-                    channel_descriptions = channels_element.findall('ChannelDescription')
                     for ch_desc in channel_descriptions:
                         channel_properties = ch_desc.findall('ChannelProperty')
                         for prop in channel_properties:
@@ -505,8 +528,9 @@ def parse_image_xml(xml_element):
                      # Now parse the actual WideFieldChannelInfo blocks
                      wf_channel_infos = wf_channel_config.findall('WideFieldChannelInfo')
                      for wfci in wf_channel_infos:
-                         fluo_cube_name = wfci.attrib.get('FluoCubeName', '')
-                         emission_str = wfci.attrib.get('EmissionWavelength', '0')
+                         wfci_attrib = wfci.attrib
+                         fluo_cube_name = wfci_attrib.get('FluoCubeName', '')
+                         emission_str = wfci_attrib.get('EmissionWavelength', '0')
                          try:
                              emission_val = float(emission_str)
                          except ValueError:
@@ -514,10 +538,10 @@ def parse_image_xml(xml_element):
 
                          # Find the highest ILLEDWavelength_i where ILLEDActiveState_i="1"
                          valid_excitation_wavelength = 0.0
-                         for i in range(8):
-                             active_state = wfci.attrib.get(f'ILLEDActiveState{i}', '0')
+                         for active_key, wavelength_key in _ILLED_KEYS:
+                             active_state = wfci_attrib.get(active_key, '0')
                              if active_state == '1':
-                                 w_str = wfci.attrib.get(f'ILLEDWavelength{i}', '0')
+                                 w_str = wfci_attrib.get(wavelength_key, '0')
                                  try:
                                      w_val = float(w_str)
                                  except ValueError:
@@ -533,25 +557,13 @@ def parse_image_xml(xml_element):
                          metadata['filterblock'].append(block_label)
 
                          # Also store contrast method if wanted
-                         contrast_method_name = wfci.attrib.get('ContrastingMethodName', '')
+                         contrast_method_name = wfci_attrib.get('ContrastingMethodName', '')
                          metadata['contrastmethod'].append(contrast_method_name)
 
 
     # Convert resolution units to micrometers
     unit = metadata['resunit'].lower()
-    factor = 1.0 # Default factor
-    if unit in ['meter', 'm']:
-        factor = 1e6
-    elif unit == 'centimeter':
-        factor = 1e4
-    elif unit == 'inch':
-        factor = 25400
-    elif unit == 'millimeter':
-        factor = 1e3
-    elif unit == 'micrometer':
-        factor = 1
-    else:
-        factor = 1  # Default to micrometers
+    factor = _UNIT_FACTOR.get(unit, 1)  # Default to micrometers
     metadata['xres2'] = metadata['xres'] * factor
     metadata['yres2'] = metadata['yres'] * factor
     metadata['zres2'] = metadata['zres'] * factor
@@ -1,7 +1,10 @@
 import os
-import json
+import mmap
 import struct
-import xml.etree.ElementTree as ET
+try:
+    from ._compat import ET, parse_utf16_xml, to_json
+except ImportError:  # pragma: no cover - fallback for script usage
+    from _compat import ET, parse_utf16_xml, to_json
 from datetime import timezone  # Import timezone
 try:
     from .ParseLeicaImageXML import parse_image_xml
@@ -13,6 +16,11 @@ except ImportError:  # pragma: no cover - fallback for script usage
     from ParseLeicaImageXMLLite import parse_image_xml_lite
 import datetime
 
+# Little-endian fields of the LIF block headers
+_INT32 = struct.Struct('<i')
+_INT64 = struct.Struct('<q')
+
+
 def filetime_to_datetime(filetime):
     """
     Converts a Windows FILETIME value (64-bit integer) to a Python datetime object (UTC).
@@ -69,7 +77,7 @@ def build_single_level_image_node(lifinfo, lif_base_name, parent_path):
     
     return node
 
-def build_single_level_lif_folder_node(folder_element, folder_uuid, image_map, folder_map, parent_map, lif_base_name, parent_path=""):
+def build_single_level_lif_folder_node(folder_element, folder_uuid, image_map, folder_map, lif_base_name, parent_path=""):
     """
     Build a single-level dictionary node for a LIF folder (just immediate children).
 
@@ -78,7 +86,6 @@ def build_single_level_lif_folder_node(folder_element, folder_uuid, image_map, f
         folder_uuid (str): UUID of the folder.
         image_map (dict): Mapping of image UUIDs to image info.
         folder_map (dict): Mapping of folder UUIDs to folder info.
-        parent_map (dict): Mapping of child UUIDs to parent UUIDs.
         lif_base_name (str): Base name of the LIF file.
         parent_path (str, optional): Path representing the parent folder hierarchy. Defaults to "".
 
@@ -115,18 +122,18 @@ def build_single_level_lif_folder_node(folder_element, folder_uuid, image_map, f
                     # It's a folder
                     if child_uuid and child_uuid in folder_map:
                         node['children'].append(
-                            build_single_level_lif_folder_node(folder_map[child_uuid], child_uuid, image_map, folder_map, parent_map, lif_base_name, current_path)
+                            build_single_level_lif_folder_node(folder_map[child_uuid], child_uuid, image_map, folder_map, lif_base_name, current_path)
                         )
             else:
                 # It's a folder
                 if child_uuid and child_uuid in folder_map:
                     node['children'].append(
-                        build_single_level_lif_folder_node(folder_map[child_uuid], child_uuid, image_map, folder_map, parent_map, lif_base_name, current_path)
+                        build_single_level_lif_folder_node(folder_map[child_uuid], child_uuid, image_map, folder_map, lif_base_name, current_path)
                     )
 
     return node
 
-def read_leica_lif(file_path, include_xmlelement=False, image_uuid=None, folder_uuid=None):
+def read_leica_lif(file_path, include_xmlelement=False, image_uuid=None, folder_uuid=None, as_dict=False):
     """
     Read Leica LIF file, extracting folder and image structures.
     Ensures:
@@ -140,6 +147,7 @@ def read_leica_lif(file_path, include_xmlelement=False, image_uuid=None, folder_
         include_xmlelement (bool, optional): Flag to include XML element data in the output. Defaults to False.
         image_uuid (str, optional): UUID of a specific image to be extracted. If provided, only this image is returned. Defaults to None.
         folder_uuid (str, optional): UUID of a specific folder to be extracted. If provided, only this folder and its children are returned. Defaults to None.
+        as_dict (bool, optional): Return the dictionary itself instead of a JSON string. Defaults to False.
 
     Returns:
         str: JSON string representing the folder and image structure, or a specific image or folder if UUIDs are provided.
@@ -157,9 +165,8 @@ def read_leica_lif(file_path, include_xmlelement=False, image_uuid=None, folder_
             raise ValueError(f'Error Opening LIF-File: {file_path}')
         testvalue = struct.unpack('i', f.read(4))[0]
         XMLObjDescriptionUTF16 = f.read(testvalue * 2)
-        XMLObjDescription = XMLObjDescriptionUTF16.decode('utf-16')
 
-    xml_root = ET.fromstring(XMLObjDescription)
+    xml_root = parse_utf16_xml(XMLObjDescriptionUTF16)
 
     # Extract Experiment Name and DateTime
     experiment_name = None
@@ -250,74 +257,65 @@ def read_leica_lif(file_path, include_xmlelement=False, image_uuid=None, folder_
             pass
         return lif_block
 
-    def find_element_and_path(el: ET.Element, target_uuid: str, parent_path: str = "", skip_self: bool = False):
-        if skip_self:
-            for ch in child_elements(el):
-                found = find_element_and_path(ch, target_uuid, parent_path="", skip_self=False)
-                if found:
-                    return found
-            return None
-        name = el.attrib.get('Name', '')
-        current_path = f"{parent_path}_{name}" if parent_path else name
-        # Match by XML UniqueID first
-        if el.attrib.get('UniqueID') == target_uuid:
-            return el, current_path
-        # Also allow matching by MemoryBlockID (BlockID) for images
-        mem = el.find('Memory')
-        if mem is not None:
-            try:
-                size_ok = int(mem.attrib.get('Size', '0')) > 0
-            except ValueError:
-                size_ok = False
-            block_id = mem.attrib.get('MemoryBlockID')
-            if size_ok and block_id and block_id == target_uuid:
+    def find_element_and_path(root: ET.Element, target_uuid: str):
+        # Iterative pre-order walk below root (root itself is skipped), in the
+        # same order the recursive search visited the elements
+        stack = [(ch, "") for ch in reversed(child_elements(root))]
+        while stack:
+            el, parent_path = stack.pop()
+            name = el.attrib.get('Name', '')
+            current_path = f"{parent_path}_{name}" if parent_path else name
+            # Match by XML UniqueID first
+            if el.attrib.get('UniqueID') == target_uuid:
                 return el, current_path
-        for ch in child_elements(el):
-            found = find_element_and_path(ch, target_uuid, current_path, skip_self=False)
-            if found:
-                return found
+            # Also allow matching by MemoryBlockID (BlockID) for images
+            mem = el.find('Memory')
+            if mem is not None:
+                try:
+                    size_ok = int(mem.attrib.get('Size', '0')) > 0
+                except ValueError:
+                    size_ok = False
+                block_id = mem.attrib.get('MemoryBlockID')
+                if size_ok and block_id and block_id == target_uuid:
+                    return el, current_path
+            stack.extend((ch, current_path) for ch in reversed(child_elements(el)))
         return None
 
     # Image request: return only that image's metadata
     if image_uuid is not None:
         # Lazily scan memory blocks only for image requests
         try:
-            with open(file_path, 'rb') as f:
+            with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
                 # Skip header and XML payload
-                _ = struct.unpack('i', f.read(4))[0]
-                _ = struct.unpack('i', f.read(4))[0]  # XMLContentLength
-                _ = struct.unpack('B', f.read(1))[0]
-                xml_len = struct.unpack('i', f.read(4))[0]
-                f.seek(xml_len * 2, os.SEEK_CUR)
+                xml_len = _INT32.unpack_from(mm, 9)[0]
+                offset = 13 + xml_len * 2
+                file_size = len(mm)
 
                 scanned_map = {}
-                while True:
-                    data = f.read(4)
-                    if not data:
-                        break
-                    marker = struct.unpack('i', data)[0]
+                while offset < file_size:
+                    marker = _INT32.unpack_from(mm, offset)[0]
                     if marker != 112:
                         raise ValueError('Error Opening LIF-File: {}'.format(file_path))
-                    _ = struct.unpack('i', f.read(4))[0]  # BinContentLength
-                    star = struct.unpack('B', f.read(1))[0]
+                    # offset + 4: BinContentLength
+                    star = mm[offset + 8]
                     if star != 42:
                         raise ValueError('Error Opening LIF-File: {}'.format(file_path))
-                    MemorySize = struct.unpack('q', f.read(8))[0]
-                    star = struct.unpack('B', f.read(1))[0]
+                    MemorySize = _INT64.unpack_from(mm, offset + 9)[0]
+                    star = mm[offset + 17]
                     if star != 42:
                         raise ValueError('Error Opening LIF-File: {}'.format(file_path))
-                    BlockIDLength = struct.unpack('i', f.read(4))[0]
-                    BlockIDData = f.read(BlockIDLength * 2)
-                    BlockID = BlockIDData.decode('utf-16')
-                    position = f.tell()
+                    BlockIDLength = _INT32.unpack_from(mm, offset + 18)[0]
+                    position = offset + 22 + BlockIDLength * 2
+                    BlockID = mm[offset + 22:position].decode('utf-16')
                     scanned_map[BlockID] = {
                         'BlockID': BlockID,
                         'MemorySize': MemorySize,
                         'Position': position,
                         'LIFFile': file_path
                     }
+                    offset = position
                     if MemorySize > 0:
-                        f.seek(MemorySize, os.SEEK_CUR)
+                        offset += MemorySize
             # Rebind the lookup so make_image_meta can use it
             blockid_to_lifinfo = scanned_map
         except Exception:
@@ -325,20 +323,21 @@ def read_leica_lif(file_path, include_xmlelement=False, image_uuid=None, folder_
         root_el = xml_root.find('Element')
         if root_el is None:
             raise ValueError('Invalid LIF XML: missing root Element')
-        found = find_element_and_path(root_el, image_uuid, skip_self=True)
+        found = find_element_and_path(root_el, image_uuid)
         if not found:
             raise ValueError(f'Image with UUID {image_uuid} not found')
         el, current_path = found
         if not is_image_element(el):
             raise ValueError(f'UUID {image_uuid} is not an image element')
-        return json.dumps(make_image_meta(el, current_path, include_metadata=True), indent=2)
+        image_meta = make_image_meta(el, current_path, include_metadata=True)
+        return image_meta if as_dict else to_json(image_meta)
 
     # Folder request: return folder with direct children only
     if folder_uuid is not None:
         root_el = xml_root.find('Element')
         if root_el is None:
             raise ValueError('Invalid LIF XML: missing root Element')
-        found = find_element_and_path(root_el, folder_uuid, skip_self=True)
+        found = find_element_and_path(root_el, folder_uuid)
         if not found:
             raise ValueError(f'Folder with UUID {folder_uuid} not found')
         folder_el, folder_path = found
@@ -361,7 +360,7 @@ def read_leica_lif(file_path, include_xmlelement=False, image_uuid=None, folder_
                     'uuid': ch_uuid,
                     'children': []
                 })
-        return json.dumps(node, indent=2)
+        return node if as_dict else to_json(node)
 
     # Default: return top-level (first-level) children only
     root_el = xml_root.find('Element')
@@ -385,4 +384,4 @@ def read_leica_lif(file_path, include_xmlelement=False, image_uuid=None, folder_
                     'uuid': ch_uuid,
                     'children': []
                 })
-    return json.dumps(node, indent=2)
+    return node if as_dict else to_json(node)
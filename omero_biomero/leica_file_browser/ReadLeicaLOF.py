@@ -1,8 +1,10 @@
 import os
 import uuid
-import json
 import struct
-import xml.etree.ElementTree as ET
+try:
+    from ._compat import parse_utf16_xml, to_json
+except ImportError:  # pragma: no cover - fallback for script usage
+    from _compat import parse_utf16_xml, to_json
 from datetime import datetime, timedelta, timezone
 try:
     from .ParseLeicaImageXML import parse_image_xml
@@ -13,6 +15,7 @@ except ImportError:  # pragma: no cover - fallback for script usage
 EPOCH_AS_FILETIME = 116444736000000000  # January 1, 1970 as MS file time
 HUNDREDS_OF_NANOSECONDS = 10000000
 
+
 def filetime_to_datetime(filetime):
     """
     Converts a Windows filetime value to a UTC datetime object.
@@ -40,13 +43,14 @@ def filetime_to_datetime(filetime):
         # Catch any other potential conversion errors
         return None
 
-def read_leica_lof(lof_file_path, include_xmlelement=False):
+def read_leica_lof(lof_file_path, include_xmlelement=False, as_dict=False):
     """
     Reads a Leica LOF file and returns ONLY the dictionary from parse_image_xml.
 
     Args:
         lof_file_path (str): Path to the .lof file.
         include_xmlelement (bool, optional): If True, embed the raw XML in the returned dictionary. Defaults to False.
+        as_dict (bool, optional): Return the dictionary itself instead of serializing it to JSON. Defaults to False.
 
     Returns:
         dict: Dictionary from parse_image_xml(...) serialized as JSON. Includes experiment datetime if available.
@@ -125,10 +129,8 @@ def read_leica_lof(lof_file_path, include_xmlelement=False):
         if len(xml_bytes) < text_length * 2:
             raise ValueError(f'Error reading LOF file (xml_bytes too short): {lof_file_path}')
 
-        xml_text = xml_bytes.decode('utf-16')
-
     # Parse the XML
-    xml_root = ET.fromstring(xml_text)
+    xml_root = parse_utf16_xml(xml_bytes)
 
     # --- Extract Experiment Datetime ---
     experiment_datetime = None
@@ -187,6 +189,6 @@ def read_leica_lof(lof_file_path, include_xmlelement=False):
 
     # Optionally include the raw XML text
     if include_xmlelement:
-        metadata["xmlElement"] = xml_text
+        metadata["xmlElement"] = xml_bytes.decode('utf-16')
 
-    return json.dumps(metadata, indent=2)
+    return metadata if as_dict else to_json(metadata)
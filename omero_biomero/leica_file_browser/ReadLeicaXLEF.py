@@ -1,6 +1,9 @@
 import os
-import json
-import xml.etree.ElementTree as ET
+import functools
+try:
+    from ._compat import ET, to_json
+except ImportError:  # pragma: no cover - fallback for script usage
+    from _compat import ET, to_json
 from urllib.parse import unquote
 from collections import deque
 try:
@@ -10,6 +13,16 @@ except ImportError:  # pragma: no cover - fallback for script usage
 from datetime import timezone # Import timezone
 import datetime
 
+
+# DimensionDescription DimID -> size key in the element metadata
+_DIM_KEY = {1: 'xs', 2: 'ys', 3: 'zs', 4: 'ts', 10: 'tiles'}
+
+
+def _file_ext(path):
+    """Lowercase extension of path without the dot (e.g. 'xlif'), or '' if it has none."""
+    return os.path.splitext(path)[1][1:].lower()
+
+
 def filetime_to_datetime(filetime):
     """
     Converts a Windows FILETIME value (64-bit integer) to a Python datetime object (UTC).
@@ -44,8 +57,6 @@ def _extract_experiment_details(xml_root):
     Returns:
         tuple: (experiment_name, experiment_datetime_str) if found, else (None, None).
     """
-    experiment_name = None
-    experiment_datetime_str = None
     try:
         element_node = xml_root.find('Element')
         if element_node is not None:
@@ -53,34 +64,81 @@ def _extract_experiment_details(xml_root):
             if data_node is not None:
                 experiment_node = data_node.find('Experiment')
                 if experiment_node is not None:
-                    exp_path = experiment_node.attrib.get('Path')
-                    if exp_path:
-                        experiment_name = os.path.basename(exp_path) # Get filename part
-
-                    timestamp_node = experiment_node.find('TimeStamp')
-                    if timestamp_node is not None:
-                        high_int = timestamp_node.attrib.get('HighInteger')
-                        low_int = timestamp_node.attrib.get('LowInteger')
-                        if high_int is not None and low_int is not None:
-                            try:
-                                filetime_val = (int(high_int) << 32) + int(low_int)
-                                dt_obj = filetime_to_datetime(filetime_val)
-                                if dt_obj:
-                                    experiment_datetime_str = dt_obj.strftime('%Y-%m-%dT%H:%M:%S')
-                            except (ValueError, TypeError):
-                                pass # Ignore conversion errors
+                    return _experiment_node_details(experiment_node)
+    except Exception:
+         pass # Ignore errors during extraction
+    return None, None
+
+
+def _experiment_node_details(experiment_node):
+    """
+    Extracts experiment name and datetime from an Experiment node.
+
+    Args:
+        experiment_node (xml.etree.ElementTree.Element): The Experiment element.
+
+    Returns:
+        tuple: (experiment_name, experiment_datetime_str), either of which may be None.
+    """
+    experiment_name = None
+    experiment_datetime_str = None
+    try:
+        exp_path = experiment_node.attrib.get('Path')
+        if exp_path:
+            experiment_name = os.path.basename(exp_path) # Get filename part
+
+        timestamp_node = experiment_node.find('TimeStamp')
+        if timestamp_node is not None:
+            high_int = timestamp_node.attrib.get('HighInteger')
+            low_int = timestamp_node.attrib.get('LowInteger')
+            if high_int is not None and low_int is not None:
+                try:
+                    filetime_val = (int(high_int) << 32) + int(low_int)
+                    dt_obj = filetime_to_datetime(filetime_val)
+                    if dt_obj:
+                        experiment_datetime_str = dt_obj.strftime('%Y-%m-%dT%H:%M:%S')
+                except (ValueError, TypeError):
+                    pass # Ignore conversion errors
     except Exception:
          pass # Ignore errors during extraction
     return experiment_name, experiment_datetime_str
 
 
-def read_leica_xlef(file_path, folder_uuid=None):
+def _stream_experiment_details(file_path):
+    """
+    Reads the experiment name and datetime from a Leica file without building the full tree.
+
+    The Experiment node lives under the top-level Element/Data, so parsing stops as soon as
+    it (or the enclosing Data/Element) has been closed instead of reading the whole file.
+
+    Args:
+        file_path (str): Path to the Leica file.
+
+    Returns:
+        tuple: (experiment_name, experiment_datetime_str) if found, else (None, None).
+    """
+    path = []
+    with open(file_path, 'rb') as fh:
+        for event, elem in ET.iterparse(fh, events=('start', 'end')):
+            if event == 'start':
+                path.append(elem.tag)
+                continue
+            depth = len(path)
+            path.pop()
+            if depth == 4 and elem.tag == 'Experiment' and path[1:] == ['Element', 'Data']:
+                return _experiment_node_details(elem)
+            if (depth == 3 and elem.tag == 'Data' and path[1] == 'Element') or (depth == 2 and elem.tag == 'Element'):
+                break
+    return None, None
+
+def read_leica_xlef(file_path, folder_uuid=None, as_dict=False):
     """
     Reads a Leica XLEF/.xlcf/.xlif file and returns the top-level structure or locates a requested folder_uuid.
 
     Args:
         file_path (str): Path to the XLEF file.
         folder_uuid (str, optional): UUID of the folder to locate. If None, returns the top-level structure.
+        as_dict (bool, optional): Return the dictionary itself instead of a JSON string. Defaults to False.
 
     Returns:
         str: JSON string containing the resulting dictionary with experiment details and structure.
@@ -92,9 +150,7 @@ def read_leica_xlef(file_path, folder_uuid=None):
     root_experiment_datetime = None
     if os.path.exists(file_path):
         try:
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-            root_experiment_name, root_experiment_datetime = _extract_experiment_details(root)
+            root_experiment_name, root_experiment_datetime = _stream_experiment_details(file_path)
         except Exception:
             pass # Ignore if root file cannot be parsed
 
@@ -106,7 +162,7 @@ def read_leica_xlef(file_path, folder_uuid=None):
     if result_dict is None:
         result_dict = {}
 
-    return json.dumps(result_dict, indent=2)
+    return result_dict if as_dict else to_json(result_dict)
 
 
 def bfs_find_uuid(top_file, folder_uuid, root_experiment_name, root_experiment_datetime):
@@ -128,7 +184,7 @@ def bfs_find_uuid(top_file, folder_uuid, root_experiment_name, root_experiment_d
     visited = set()
     queue = deque()
 
-    top_ext = top_file.lower().split('.')[-1]
+    top_ext = _file_ext(top_file)
     top_element, top_refs, top_root = parse_file_minimal(top_file) # Modified to return root
     if top_element is None:
         return None
@@ -199,7 +255,7 @@ def parse_file_minimal(file_path):
         ref_path = ref_path.replace("\\", "/")  # Normalize Windows slashes to POSIX
         ref_path = os.path.normpath(os.path.join(os.path.dirname(file_path), ref_path))
         ref_uuid = ref.get("UUID") or ""
-        ref_ext = ref_path.lower().split('.')[-1]
+        ref_ext = _file_ext(ref_path)
         refs.append((ref_path, ref_uuid, ref_ext))
 
     return main_el, refs, root # Return the parsed root
@@ -260,7 +316,7 @@ def parse_top_level(file_path, root_experiment_name, root_experiment_datetime):
     if not os.path.exists(file_path):
         return None
 
-    extension = file_path.lower().split('.')[-1]
+    extension = _file_ext(file_path)
     try: 
         tree = ET.parse(file_path)
         root = tree.getroot()
@@ -315,7 +371,7 @@ def _build_children_list(element, base_file, top_file, experiment_name, experime
         ref_file = os.path.normpath(os.path.join(os.path.dirname(base_file), ref_file))
 
         ref_uuid = ref.get("UUID") or ""
-        ext = ref_file.lower().split('.')[-1]
+        ext = _file_ext(ref_file)
 
         ctype = 'Folder' if ext == 'xlcf' else 'Image' if ext == 'xlif' else 'File' if ext == 'xlef' else 'Unknown'
 
@@ -377,6 +433,23 @@ def get_element_metadata(file_path, target_uuid=None):
     Returns:
         dict: Metadata dictionary for the element, including dimensions, channels, and file paths.
     """
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return _read_element_metadata(file_path, target_uuid)
+    # The cached dict is shared, so hand out a copy callers can modify
+    return dict(_element_metadata_cached(file_path, target_uuid, st.st_mtime_ns, st.st_size))
+
+
+@functools.lru_cache(maxsize=256)
+def _element_metadata_cached(file_path, target_uuid, mtime_ns, size):
+    # mtime_ns and size are only part of the cache key, so a changed file is
+    # read again
+    return _read_element_metadata(file_path, target_uuid)
+
+
+def _read_element_metadata(file_path, target_uuid=None):
+    """Reads the metadata returned by get_element_metadata from the file itself."""
     if not os.path.exists(file_path):
         return {
             "ElementName": "Unnamed", "LOFFile": None, "filetype": None, # Added filetype
@@ -402,48 +475,46 @@ def get_element_metadata(file_path, target_uuid=None):
     }
     
     # Determine filetype from extension
-    ext = file_path.lower().split('.')[-1]
+    ext = _file_ext(file_path)
     if ext in ['xlef', 'xlcf', 'xlif', 'lof']:
         metadata['filetype'] = '.' + ext
 
-    if not os.path.exists(file_path):
-        return metadata # Return initialized metadata
-
-    try:
-        tree = ET.parse(file_path)
-        root = tree.getroot()
-    except Exception:
-        return metadata # Return initialized metadata
+    # One walk over the descendants of root finds the target Element, the
+    # first Memory/Block and the first ImageDescription
+    element = memory_block = image_description = None
+    for node in root.iter():
+        if node is root:
+            continue
+        tag = node.tag
+        if tag == 'Element':
+            if element is None and (not target_uuid or node.get('UniqueID') == target_uuid):
+                element = node
+        elif tag == 'Memory':
+            if memory_block is None:
+                memory_block = node.find('Block')
+        elif tag == 'ImageDescription':
+            if image_description is None:
+                image_description = node
+        if element is not None and memory_block is not None and image_description is not None:
+            break
 
-    element = root.find(f".//Element[@UniqueID='{target_uuid}']") if target_uuid else root.find(".//Element")
     if element is not None:
         metadata["ElementName"] = element.get("Name", "Unnamed")
     
-    memory_block = root.find('.//Memory/Block')
     if memory_block is not None:
         block_file = memory_block.attrib.get('File')
         if block_file and block_file.lower().endswith('.lof'):
             block_file = unquote(block_file).replace("\\", "/")
             metadata["LOFFile"] = block_file
     
-    image_description = root.find('.//ImageDescription')
     if image_description is not None:
         dimensions_element = image_description.find('Dimensions')
         if dimensions_element is not None:
             dim_descriptions = dimensions_element.findall('DimensionDescription')
             for dim_desc in dim_descriptions:
-                dim_id = int(dim_desc.attrib.get('DimID', '0'))
-                num_elements = int(dim_desc.attrib.get('NumberOfElements', '1'))
-                if dim_id == 1:
-                    metadata['xs'] = num_elements
-                elif dim_id == 2:
-                    metadata['ys'] = num_elements
-                elif dim_id == 3:
-                    metadata['zs'] = num_elements
-                elif dim_id == 4:
-                    metadata['ts'] = num_elements
-                elif dim_id == 10:
-                    metadata['tiles'] = num_elements
+                dim_key = _DIM_KEY.get(int(dim_desc.get('DimID', '0')))
+                if dim_key is not None:
+                    metadata[dim_key] = int(dim_desc.get('NumberOfElements', '1'))
         
         channels_element = image_description.find('Channels')
         if channels_element is not None:
@@ -0,0 +1,56 @@
+"""
+Optional speedups shared by the Leica readers.
+
+lxml (XML parsing) and orjson (JSON output) are used when they are installed
+(pip install omero-biomero[fast]); otherwise the standard library is used.
+"""
+import json
+
+try:
+    from lxml import etree as ET  # optional, faster XML parsing
+    HAVE_LXML = True
+except ImportError:  # pragma: no cover - lxml not installed
+    import xml.etree.ElementTree as ET
+    HAVE_LXML = False
+try:
+    import orjson  # optional, faster JSON serialization
+except ImportError:  # pragma: no cover - orjson not installed
+    orjson = None
+
+__all__ = ["ET", "HAVE_LXML", "parse_utf16_xml", "to_json"]
+
+_UTF16_BOMS = (b'\xff\xfe', b'\xfe\xff')
+
+
+def parse_utf16_xml(data):
+    """
+    Parses a UTF-16 encoded Leica XML header (LIF/LOF) into its root element.
+
+    Args:
+        data (bytes): The UTF-16 encoded XML, as stored in the file.
+
+    Returns:
+        Element: Root element of the parsed XML.
+    """
+    if not HAVE_LXML:
+        return ET.fromstring(data.decode('utf-16'))
+    # Give lxml the raw bytes and their encoding: it refuses str input that
+    # carries an encoding declaration. Leica writes little-endian UTF-16
+    # without a BOM.
+    encoding = 'UTF-16' if data[:2] in _UTF16_BOMS else 'UTF-16LE'
+    try:
+        return ET.fromstring(data, ET.XMLParser(encoding=encoding))
+    except ET.XMLSyntaxError:
+        # lxml rejects very large text nodes and deep trees by default, which
+        # big tilescan headers can hit; retry without those limits
+        return ET.fromstring(data, ET.XMLParser(encoding=encoding, huge_tree=True))
+
+
+def to_json(data):
+    """Serializes reader output as 2-space indented JSON, with orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+        except TypeError:  # orjson.JSONEncodeError, e.g. huge ints
+            pass
+    return json.dumps(data, indent=2)
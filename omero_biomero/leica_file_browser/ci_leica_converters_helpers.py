@@ -45,6 +45,7 @@ fields. If offline, callers can ignore `metadata_schema` and skip validation.
 
 import os
 import json
+import functools
 import tempfile
 import numpy as np
 import xml.etree.ElementTree as ET
@@ -52,6 +53,11 @@ import urllib.request
 import math
 from typing import Dict, List, Tuple
 
+try:
+    import orjson  # optional, faster JSON parsing
+except ImportError:  # pragma: no cover - orjson not installed
+    orjson = None
+
 try:
     # Package context (e.g., inside omero_biomero.leica_file_browser)
     from .ReadLeicaLIF import read_leica_lif
@@ -77,7 +83,18 @@ dtype_to_format = {
 }
 
 
-def read_leica_file(file_path, include_xmlelement=False, image_uuid=None, folder_uuid=None):
+# extension -> reader(file_path, include_xmlelement, image_uuid, folder_uuid, as_dict)
+_LEICA_READERS = {
+    '.lif': lambda path, xml, image_uuid, folder_uuid, as_dict: read_leica_lif(
+        path, xml, image_uuid, folder_uuid, as_dict=as_dict),
+    '.xlef': lambda path, xml, image_uuid, folder_uuid, as_dict: read_leica_xlef(
+        path, folder_uuid, as_dict=as_dict),
+    '.lof': lambda path, xml, image_uuid, folder_uuid, as_dict: read_leica_lof(
+        path, xml, as_dict=as_dict),
+}
+
+
+def read_leica_file(file_path, include_xmlelement=False, image_uuid=None, folder_uuid=None, as_dict=False):
     """
     Read Leica LIF, XLEF, or LOF file.
 
@@ -86,6 +103,7 @@ def read_leica_file(file_path, include_xmlelement=False, image_uuid=None, folder
     - include_xmlelement: whether to include the XML element in the lifinfo dictionary
     - image_uuid: optional UUID of an image
     - folder_uuid: optional UUID of a folder/collection
+    - as_dict: return the metadata dictionary instead of a JSON string
 
     Returns:
     - If image_uuid is provided:
@@ -94,30 +112,68 @@ def read_leica_file(file_path, include_xmlelement=False, image_uuid=None, folder
         - Returns a single-level XML tree (as a string) of that folder (its immediate children only).
     - Else (no image_uuid or folder_uuid):
         - Returns a single-level XML tree (as a string) of the root/top-level folder(s) or items.
+    With as_dict=True the same structures are returned as dictionaries.
     """
     _, ext = os.path.splitext(file_path)
     ext = ext.lower()
 
-    if ext == '.lif':
-        return read_leica_lif(file_path, include_xmlelement, image_uuid, folder_uuid)
-    elif ext == '.xlef':
-        return read_leica_xlef(file_path, folder_uuid)
-    elif ext == '.lof':
-        return read_leica_lof(file_path, include_xmlelement)
-    else:
+    reader = _LEICA_READERS.get(ext)
+    if reader is None:
         raise ValueError('Unsupported file type: {}'.format(ext))
+    return reader(file_path, include_xmlelement, image_uuid, folder_uuid, as_dict)
+
+
+def read_leica_file_dict(file_path, **kwargs):
+    """
+    Same as read_leica_file, but returns the metadata as a dictionary
+    instead of a JSON string, for callers that would parse it again.
+    """
+    return read_leica_file(file_path, as_dict=True, **kwargs)
+
+
+@functools.lru_cache(maxsize=128)
+def _read_leica_file_cached(file_path, mtime_ns, size):
+    # mtime_ns and size are only part of the cache key, so a changed file is
+    # read again
+    return read_leica_file(file_path)
+
+
+def _index_children(folder_metadata_dict: dict) -> dict:
+    """Map uuid -> child of a folder; the first child wins on duplicates."""
+    children_by_uuid = {}
+    for img in folder_metadata_dict["children"]:
+        children_by_uuid.setdefault(img["uuid"], img)
+    return children_by_uuid
+
+
+@functools.lru_cache(maxsize=32)
+def _index_folder_metadata(folder_metadata: str) -> dict:
+    # Callers only read the result, so the same index can be shared
+    if orjson is not None:
+        return _index_children(orjson.loads(folder_metadata))
+    return _index_children(json.loads(folder_metadata))
+
+
+def _folder_children_by_uuid(folder_metadata) -> dict:
+    """
+    uuid -> child index of the folder metadata (a dict or a JSON string).
+    JSON strings are parsed and indexed once and reused.
+    """
+    if isinstance(folder_metadata, dict):
+        return _index_children(folder_metadata)
+    return _index_folder_metadata(folder_metadata)
 
 
 def get_image_metadata_LOF(folder_metadata, image_uuid):
-    folder_metadata_dict = json.loads(folder_metadata)
-    image_metadata_dict = next((img for img in folder_metadata_dict["children"] if img["uuid"] == image_uuid), None)
-    image_metadata = read_leica_file(image_metadata_dict['lof_file_path'])
+    image_metadata_dict = _folder_children_by_uuid(folder_metadata).get(image_uuid)
+    lof_file_path = image_metadata_dict['lof_file_path']
+    st = os.stat(lof_file_path)
+    image_metadata = _read_leica_file_cached(lof_file_path, st.st_mtime_ns, st.st_size)
     return image_metadata
 
 
 def get_image_metadata(folder_metadata, image_uuid):
-    folder_metadata_dict = json.loads(folder_metadata)
-    image_metadata_dict = next((img for img in folder_metadata_dict["children"] if img["uuid"] == image_uuid), None)
+    image_metadata_dict = _folder_children_by_uuid(folder_metadata).get(image_uuid)
     image_metadata = json.dumps(image_metadata_dict, indent=2)
     return image_metadata
 
@@ -498,7 +554,7 @@ def _read_xlef_image(xlef_path: str, image_uuid: str) -> dict:
         processed_paths.add(current)
 
         try:
-            meta = json.loads(read_leica_xlef(current))
+            meta = read_leica_xlef(current, as_dict=True)
         except Exception as e:
             print(f"Warning: Could not read linked XLEF '{current}': {e}")
             continue  # Skip unreadable files
@@ -510,7 +566,7 @@ def _read_xlef_image(xlef_path: str, image_uuid: str) -> dict:
             if "lof_file_path" in maybe and maybe["lof_file_path"]:
                 try:
                     # merge LOF metadata if present
-                    lof_meta = json.loads(read_leica_lof(maybe["lof_file_path"], include_xmlelement=True))
+                    lof_meta = read_leica_lof(maybe["lof_file_path"], include_xmlelement=True, as_dict=True)
                     maybe.update(lof_meta)
                     # Restore original name if it was overwritten by LOF merge
                     if original_save_child_name is not None:
@@ -539,19 +595,17 @@ def _read_xlef_image(xlef_path: str, image_uuid: str) -> dict:
 def read_image_metadata(file_path: str, image_uuid: str) -> dict:
     """Front-end that works for .lif / .xlef / .lof."""
     if file_path.endswith(".lif"):
-        meta_str = read_leica_lif(file_path, include_xmlelement=True, image_uuid=image_uuid)
-        if not meta_str:
+        meta = read_leica_lif(file_path, include_xmlelement=True, image_uuid=image_uuid, as_dict=True)
+        if not meta:
             raise ValueError(f"Image UUID {image_uuid} not found in LIF file {file_path}")
-        meta = json.loads(meta_str)
         # Ensure essential fields exist
         meta.setdefault("filetype", ".lif")
         meta.setdefault("LIFFile", file_path)
         return meta
     if file_path.endswith(".lof"):
-        meta_str = read_leica_lof(file_path, include_xmlelement=True)
-        if not meta_str:
+        meta = read_leica_lof(file_path, include_xmlelement=True, as_dict=True)
+        if not meta:
             raise ValueError(f"Could not read LOF file {file_path}")
-        meta = json.loads(meta_str)
         meta.setdefault("filetype", ".lof")
         meta.setdefault("LOFFilePath", file_path)
         return meta
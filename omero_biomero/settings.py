@@ -1,10 +1,12 @@
 import os
 import json
-from .leica_file_browser.ci_leica_converters_helpers import read_leica_file
+from .leica_file_browser.ci_leica_converters_helpers import read_leica_file_dict
 
+# File browsers return the metadata as a dict; browsers returning a JSON
+# string are accepted too
 EXTENSION_TO_FILE_BROWSER = {
-    ".lif": read_leica_file,
-    ".xlef": read_leica_file,
+    ".lif": read_leica_file_dict,
+    ".xlef": read_leica_file_dict,
 }
 
 # FILE_OR_EXTENSION_PATTERNS_EXCLUSIVE defines patterns that, when
@@ -1,3 +1,4 @@
+import configparser
 import json
 import sys
 import types
@@ -43,13 +44,13 @@ def _ensure_stub_modules():  # Create stubs if external deps missing.
 
 
 def _raw_admin_config():
-    """Return the undecorated view function for direct logic testing."""
+    """Return the view without its Django decorators, keeping the admin check."""
     from omero_biomero import admin_views
 
     fn = admin_views.admin_config
     while hasattr(fn, "__wrapped__"):
         fn = fn.__wrapped__
-    return fn
+    return admin_views.admin_required(fn)
 
 
 def _fake_conn(is_admin=True, user_id=1, username="admin"):
@@ -58,6 +59,9 @@ def _fake_conn(is_admin=True, user_id=1, username="admin"):
     user.getId.return_value = user_id
     conn = MagicMock()
     conn.getUser.return_value = user
+    conn.getEventContext.return_value = SimpleNamespace(
+        userId=user_id, userName=username, isAdmin=is_admin
+    )
     conn.isAdmin.return_value = is_admin
     return conn
 
@@ -83,6 +87,15 @@ class AdminConfigTests(TestCase):
         data = json.loads(resp.content)
         self.assertEqual(data["error"], "Unauthorized request")
 
+    def test_admin_check_uses_event_context(self):
+        view = _raw_admin_config()
+        conn = _fake_conn(is_admin=False)
+        request = SimpleNamespace(method="GET")
+        self.assertEqual(view(request, conn=conn).status_code, 403)
+        conn.getEventContext.return_value.isAdmin = True
+        self.assertEqual(view(request, conn=conn).status_code, 200)
+        conn.getUser.assert_not_called()
+
     def test_get_success(self):
         SlurmClient = sys.modules["biomero"].SlurmClient  # stub or real
         cfg_path = Path(self._create_tempfile("[SEC]\nkey=value\n"))
@@ -100,6 +113,31 @@ class AdminConfigTests(TestCase):
         data = json.loads(resp.content)
         self.assertEqual(data["config"]["SEC"]["key"], "value")
 
+    def test_get_rereads_only_changed_config(self):
+        cfg_path = Path(self._create_tempfile("[SEC]\nkey=value\n"))
+
+        class StubSlurm:
+            _DEFAULT_CONFIG_PATH_1 = "unused"
+            _DEFAULT_CONFIG_PATH_2 = "unused"
+            _DEFAULT_CONFIG_PATH_3 = str(cfg_path)
+
+        view = _raw_admin_config()
+        request = SimpleNamespace(method="GET")
+        with patch("omero_biomero.admin_views.SlurmClient", StubSlurm), patch(
+            "omero_biomero.admin_views.configparser.ConfigParser.read",
+            autospec=True,
+            side_effect=configparser.ConfigParser.read,
+        ) as read:
+            view(request, conn=_fake_conn())
+            resp = view(request, conn=_fake_conn())
+            self.assertEqual(read.call_count, 1)
+            self.assertEqual(json.loads(resp.content)["config"]["SEC"]["key"], "value")
+
+            cfg_path.write_text("[SEC]\nkey=changed\n")
+            resp = view(request, conn=_fake_conn())
+            self.assertEqual(read.call_count, 2)
+        self.assertEqual(json.loads(resp.content)["config"]["SEC"]["key"], "changed")
+
     def test_post_invalid_json(self):
         view = _raw_admin_config()
         request = SimpleNamespace(method="POST", body=b"not-json")
@@ -19,6 +19,12 @@ class AnalyzerViewsTests(TestCase):
     def setUpClass(cls):
         super().setUpClass()
 
+    def setUp(self):
+        from omero_biomero import analyzer_views as av
+
+        av._SCRIPT_ID_CACHE.clear()
+        av.invalidate_workflow_caches()
+
     # Helper: stub SlurmClient context manager
     class _StubSlurmBase:
         slurm_model_images = {"wfA": "img"}
@@ -137,6 +143,23 @@ class AnalyzerViewsTests(TestCase):
             resp = view(request, conn=conn)
         self.assertEqual(resp.status_code, 500)
 
+    def test_resolve_script_id_cached(self):
+        from omero_biomero.analyzer_views import _resolve_script_id
+
+        class Script:
+            id = 5
+
+            def getName(self):
+                return "SLURM_Run_Workflow.py"
+
+        svc = MagicMock()
+        svc.getScripts.return_value = [Script()]
+        self.assertEqual(_resolve_script_id(svc, "SLURM_Run_Workflow.py"), 5)
+        self.assertEqual(_resolve_script_id(svc, "SLURM_Run_Workflow.py"), 5)
+        self.assertIsNone(_resolve_script_id(svc, "Missing.py"))
+        # Two lookups of a cached name and one miss -> only the miss refetches
+        self.assertEqual(svc.getScripts.call_count, 2)
+
     # --- list_workflows ---
     def test_list_workflows_success(self):
         class StubSlurm(self._StubSlurmBase):
@@ -150,6 +173,47 @@ class AnalyzerViewsTests(TestCase):
         data = json.loads(resp.content)
         self.assertCountEqual(data["workflows"], ["wfA", "wfB"])
 
+    def test_list_workflows_reuses_shared_client(self):
+        created = []
+
+        class StubSlurm(self._StubSlurmBase):
+            @classmethod
+            def from_config(cls, config_only=True):
+                created.append(config_only)
+                return cls()
+
+        with patch("omero_biomero.analyzer_views.SlurmClient", StubSlurm):
+            view = _raw("list_workflows")
+            request = SimpleNamespace(method="GET")
+            self.assertEqual(view(request).status_code, 200)
+            self.assertEqual(view(request).status_code, 200)
+        self.assertEqual(created, [True])
+
+    def test_shared_client_replaced_not_closed(self):
+        from omero_biomero import analyzer_views as av
+
+        closed = []
+
+        class StubSlurm(self._StubSlurmBase):
+            def __exit__(self, exc_type, exc, tb):
+                closed.append(self)
+                return False
+
+        with patch("omero_biomero.analyzer_views.SlurmClient", StubSlurm):
+            first = av.get_shared_slurm_client()
+            self.assertIs(av.get_shared_slurm_client(), first)
+            # Age the shared client past its TTL
+            client, created_at = av._SHARED_SLURM_CLIENT
+            av._SHARED_SLURM_CLIENT = (
+                client,
+                created_at - av._SLURM_CLIENT_TTL - 1,
+            )
+            second = av.get_shared_slurm_client()
+            self.assertIsNot(second, first)
+            av.invalidate_workflow_caches()
+            self.assertIsNot(av.get_shared_slurm_client(), second)
+        self.assertEqual(closed, [])
+
     def test_list_workflows_error(self):
         class StubSlurmError(self._StubSlurmBase):
             def __enter__(self):
@@ -194,6 +258,45 @@ class AnalyzerViewsTests(TestCase):
         self.assertIn("inputs", data)
         self.assertIn("githubUrl", data)
 
+    def test_get_workflow_metadata_cached(self):
+        pulls = []
+
+        class StubSlurm(self._StubSlurmBase):
+            def pull_descriptor_from_github(self, name):
+                pulls.append(name)
+                return {"inputs": []}
+
+        with patch("omero_biomero.analyzer_views.SlurmClient", StubSlurm):
+            view = _raw("get_workflow_metadata")
+            request = SimpleNamespace(method="GET")
+            self.assertEqual(view(request, name="wfA").status_code, 200)
+            self.assertEqual(view(request, name="wfA").status_code, 200)
+        self.assertEqual(pulls, ["wfA"])
+
+    def test_get_workflow_metadata_refetched_after_ttl(self):
+        from omero_biomero import analyzer_views as av
+
+        pulls = []
+
+        class StubSlurm(self._StubSlurmBase):
+            def pull_descriptor_from_github(self, name):
+                pulls.append(name)
+                return {"inputs": []}
+
+        with patch("omero_biomero.analyzer_views.SlurmClient", StubSlurm):
+            view = _raw("get_workflow_metadata")
+            request = SimpleNamespace(method="GET")
+            self.assertEqual(view(request, name="wfA").status_code, 200)
+            # Age the cached descriptor past its TTL
+            descriptor, schema_by_id, cached_at = av._DESCRIPTOR_CACHE["wfA"]
+            av._DESCRIPTOR_CACHE["wfA"] = (
+                descriptor,
+                schema_by_id,
+                cached_at - av._DESCRIPTOR_CACHE_TTL - 1,
+            )
+            self.assertEqual(view(request, name="wfA").status_code, 200)
+        self.assertEqual(pulls, ["wfA", "wfA"])
+
     # GitHub URL is provided by get_workflow_metadata in field 'githubUrl'
 
     # --- get_workflows (script menu) ---
@@ -219,19 +322,17 @@ class AnalyzerViewsTests(TestCase):
         conn = MagicMock()
         conn.getScriptService.return_value = scriptService
 
-        # getObject returns script-like object for id 10 & 30, None for 20
+        # getObjects returns script-like objects for id 10 & 30, not 20
         class ScriptObj:
-            def __init__(self, name):
+            def __init__(self, id, name):
+                self.id = id
                 self.name = name
 
-        def getObject_side(_typ, sid):
-            if sid == 10:
-                return ScriptObj("Script_One")
-            if sid == 30:
-                return ScriptObj("Script_Three")
-            return None
+        def getObjects_side(_typ, ids):
+            known = {10: "Script_One", 30: "Script_Three"}
+            return [ScriptObj(sid, known[sid]) for sid in ids if sid in known]
 
-        conn.getObject.side_effect = getObject_side
+        conn.getObjects.side_effect = getObjects_side
         view = _raw("get_workflows")
         request = SimpleNamespace(method="GET", GET={"script_ids": "10,20,30"})
         resp = view(request, conn=conn)
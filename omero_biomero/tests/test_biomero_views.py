@@ -89,6 +89,36 @@ class BiomeroViewTests(TestCase):
         )
         self.assertIn("resource", decoded)
 
+    def test_biomero_tokens_reused_within_window(self):
+        from omero_biomero import biomero_views
+
+        biomero_views._sign_dashboard_token.cache_clear()
+        env = {
+            "METABASE_SECRET_KEY": "secret",
+            "METABASE_WORKFLOWS_DB_PAGE_DASHBOARD_ID": "11",
+            "METABASE_IMPORTS_DB_PAGE_DASHBOARD_ID": "22",
+        }
+        with patch.dict(os.environ, env, clear=False), patch(
+            "omero_biomero.biomero_views.get_react_build_file",
+            return_value="main.js",
+        ), patch("omero_biomero.biomero_views.time.time") as now:
+            now.return_value = 1_000_000
+            first = _raw_biomero()(None, conn=self._fake_conn())
+            now.return_value = 1_000_010
+            second = _raw_biomero()(None, conn=self._fake_conn())
+
+        self.assertEqual(
+            first["metabase_token_imports"], second["metabase_token_imports"]
+        )
+        decoded = jwt.decode(
+            first["metabase_token_imports"],
+            env["METABASE_SECRET_KEY"],
+            algorithms=["HS256"],
+            options={"verify_exp": False},
+        )
+        self.assertEqual(decoded["params"], {"user_name": ["alice"]})
+        self.assertGreaterEqual(decoded["exp"] - 1_000_010, 60 * 25)
+
     def test_biomero_missing_env_defaults(self):
         # Ensure missing optional env falls back gracefully (tokens will error if key missing)
         with patch.dict(
@@ -5,7 +5,7 @@ import uuid as _uuid
 import types
 import shutil
 from typing import Any
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from django.test import TestCase, RequestFactory
 from django.http import JsonResponse
 
@@ -164,6 +164,12 @@ class ImporterViewsTests(TestCase):
         resp: Any = self._call_get_folder(expect_ok=False)
         self.assertEqual(getattr(resp, "status_code", None), 400)
 
+    def test_get_folder_contents_duplicate_exact_name_error(self):
+        open(os.path.join(self.tmp, "experiment.db"), "w").close()
+        open(os.path.join(self.tmp, "Experiment.DB"), "w").close()
+        resp: Any = self._call_get_folder(expect_ok=False)
+        self.assertEqual(getattr(resp, "status_code", None), 400)
+
     def test_get_folder_contents_conflicting_patterns(self):
         open(os.path.join(self.tmp, "experiment.db"), "w").close()
         open(os.path.join(self.tmp, "c.xlef"), "w").close()
@@ -199,6 +205,65 @@ class ImporterViewsTests(TestCase):
         self.assertEqual(len(ctx["contents"]), 1)
         self.assertTrue(ctx["contents"][0]["id"].startswith("abc.lif#"))
 
+    def test_get_folder_contents_file_browser_cached_until_file_changes(self):
+        calls = []
+
+        def stub_browser(path, folder_uuid=None, image_uuid=None):  # pragma: no cover
+            calls.append((path, folder_uuid, image_uuid))
+            return json.dumps({"children": [{"name": "img", "uuid": "u1", "type": "Image"}]})
+
+        setattr(self.mod, "EXTENSION_TO_FILE_BROWSER", {".lif": stub_browser})  # type: ignore[attr-defined]
+        lif = os.path.join(self.tmp, "cached.lif")
+        open(lif, "w").close()
+        self._call_get_folder({"item_id": "cached.lif"})
+        self._call_get_folder({"item_id": "cached.lif"})
+        self.assertEqual(len(calls), 1)
+        # Other options are cached separately
+        self._call_get_folder({"item_id": "cached.lif#u1"})
+        self.assertEqual(len(calls), 2)
+        # A changed file is read again
+        with open(lif, "w") as f:
+            f.write("changed")
+        self._call_get_folder({"item_id": "cached.lif"})
+        self.assertEqual(len(calls), 3)
+
+    def test_browse_file_copies_cached_result_and_skips_missing_files(self):
+        calls = []
+
+        def stub_browser(path):  # pragma: no cover
+            calls.append(path)
+            return {"children": []}
+
+        lif = os.path.join(self.tmp, "copied.lif")
+        open(lif, "w").close()
+        first = self.mod._browse_file(stub_browser, lif)  # type: ignore[attr-defined]
+        first["children"] = None
+        second = self.mod._browse_file(stub_browser, lif)  # type: ignore[attr-defined]
+        self.assertEqual(second, {"children": []})
+        self.assertEqual(len(calls), 1)
+        # A file that can't be stat'ed is browsed directly, without caching
+        missing = os.path.join(self.tmp, "gone.lif")
+        self.mod._browse_file(stub_browser, missing)  # type: ignore[attr-defined]
+        self.mod._browse_file(stub_browser, missing)  # type: ignore[attr-defined]
+        self.assertEqual(calls, [lif, missing, missing])
+
+    def test_get_folder_contents_listing_metadata_only_on_request(self):
+        calls = []
+
+        def stub_browser(path, folder_uuid=None, image_uuid=None):  # pragma: no cover
+            calls.append(path)
+            return {"children": []}
+
+        setattr(self.mod, "EXTENSION_TO_FILE_BROWSER", {".lif": stub_browser})  # type: ignore[attr-defined]
+        open(os.path.join(self.tmp, "lazy.lif"), "w").close()
+        ctx = self._call_get_folder()
+        self.assertEqual(calls, [])
+        self.assertIsNone(ctx["contents"][0]["metadata"])
+        self.assertTrue(ctx["contents"][0]["is_folder"])
+        ctx = self._call_get_folder({"include_metadata": "1"})
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(ctx["contents"][0]["metadata"], {"children": []})
+
     def test_get_folder_contents_supported_extension_path(self):
         open(os.path.join(self.tmp, "sample.tif"), "w").close()
         ctx = self._call_get_folder({"item_id": "sample.tif"})
@@ -225,6 +290,26 @@ class ImporterViewsTests(TestCase):
         ctx = self._call_get_folder()
         self.assertEqual([c["name"] for c in ctx["contents"]], ["one.xlef"])
 
+    def test_get_folder_contents_rejects_path_outside_base_dir(self):
+        sibling = self.tmp + "_sibling"
+        os.makedirs(sibling)
+        self.addCleanup(shutil.rmtree, sibling, True)
+        for item_id in ["..", "../" + os.path.basename(sibling), sibling]:
+            resp = self._call_get_folder({"item_id": item_id}, expect_ok=False)
+            self.assertEqual(getattr(resp, "status_code", None), 400)
+
+    def test_get_folder_contents_missing_path_cached_briefly(self):
+        resp = self._call_get_folder({"item_id": "later"}, expect_ok=False)
+        self.assertEqual(getattr(resp, "status_code", None), 400)
+        os.makedirs(os.path.join(self.tmp, "later"))
+        # Still reported missing while the negative cache entry is fresh
+        with patch.object(self.mod.os, "stat", wraps=os.stat) as stat_mock:
+            resp = self._call_get_folder({"item_id": "later"}, expect_ok=False)
+        self.assertEqual(getattr(resp, "status_code", None), 400)
+        stat_mock.assert_not_called()
+        setattr(self.mod, "_MISSING_PATHS_TTL", 0)  # type: ignore[attr-defined]
+        self.assertEqual(self._call_get_folder({"item_id": "later"})["contents"], [])
+
     # import_selected tests
     def _post_import(self, payload, conn=None):
         req = self.factory.post(
@@ -417,6 +502,28 @@ class ImporterViewsTests(TestCase):
             json.loads(got.content)["mappings"], {"g1": "labA", "g2": "labB"}
         )
 
+    def test_group_mappings_get_rereads_only_changed_file(self):
+        cfg = os.path.join(self.tmp, "config.json")
+        setattr(self.mod, "CONFIG_FILE_PATH", cfg)  # type: ignore[attr-defined]
+        with open(cfg, "w") as f:
+            json.dump({"group_mappings": {"g1": "labA"}}, f)
+
+        def get():
+            req = self.factory.get("/importer/group_mappings")
+            resp = _raw(self.mod.group_mappings)(req, conn=self.conn)
+            return json.loads(resp.content)["mappings"]
+
+        with patch.object(
+            self.mod, "json_loads", side_effect=self.mod.json_loads
+        ) as loads:
+            self.assertEqual(get(), {"g1": "labA"})
+            self.assertEqual(get(), {"g1": "labA"})
+            self.assertEqual(loads.call_count, 1)
+            with open(cfg, "w") as f:
+                json.dump({"group_mappings": {"g1": "labB", "g2": "x"}}, f)
+            self.assertEqual(get(), {"g1": "labB", "g2": "x"})
+            self.assertEqual(loads.call_count, 2)
+
     def test_group_mappings_post_invalid_json(self):
         cfg = os.path.join(self.tmp, "config.json")
         setattr(self.mod, "CONFIG_FILE_PATH", cfg)  # type: ignore[attr-defined]
@@ -2,9 +2,58 @@ import json
 import os
 import logging
 
+from django.http import HttpResponse, JsonResponse
+
+try:
+    import orjson
+except ImportError:  # optional speedup, fall back to the stdlib encoder
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def json_loads(data):
+    """
+    Parse a JSON str or bytes, with orjson when it is installed.
+
+    Raises json.JSONDecodeError (orjson's error subclasses it) on bad input.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps_indented(data):
+    """
+    Serialize data as 2-space indented JSON (bytes), with orjson when it is
+    installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
+class FastJsonResponse(JsonResponse):
+    """
+    JsonResponse that serializes with orjson when it is installed.
+
+    Falls back to Django's JsonResponse (stdlib json) when orjson is not
+    available or can't encode the data, so it is a drop-in replacement.
+    """
+
+    def __init__(self, data, safe=True, **kwargs):
+        if orjson is not None and (isinstance(data, dict) or not safe):
+            try:
+                content = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+            except TypeError:  # orjson.JSONEncodeError, e.g. huge ints
+                pass
+            else:
+                kwargs.setdefault("content_type", "application/json")
+                HttpResponse.__init__(self, content=content, **kwargs)
+                return
+        super().__init__(data, safe=safe, **kwargs)
+
+
 def parse_bool_env(env_var, default=True):
     """
     Parse environment variable as boolean with graceful handling of multiple formats.
@@ -79,31 +128,38 @@ def check_directory_permissions(path):
         return False, f"Error checking directory access: {str(e)}"
 
 
-def build_extra_params(template_extra, uuid_value):
+class ExtraParamsTemplate:
     """
-    Materialize extra preprocessing parameters from a template dict.
-
-    Behavior:
-        - For each key/value in template_extra:
-                * If value is a string containing the {UUID} placeholder and
-                    a uuid_value is provided, substitute it.
-                * If value contains {UUID} but no uuid_value is provided,
-                    skip that key.
-                * Otherwise copy the value as-is.
-    - Returns a new dict or None if no parameters remain after filtering.
+    A preprocessing extra_params template, scanned for {UUID} once.
+
+    render(uuid_value) materializes the parameters:
+        - string values containing the {UUID} placeholder get uuid_value
+          substituted, or are skipped if no uuid_value is given;
+        - other values are copied as-is.
+    It returns a new dict, or None if no parameters remain.
     """
-    if not template_extra:
-        return None
-
-    realized = {}
-    for key, value in template_extra.items():
-        if isinstance(value, str) and "{UUID}" in value:
-            if uuid_value:
-                realized[key] = value.replace("{UUID}", uuid_value)
-            else:
-                # Skip param requiring UUID when none available
-                continue
-        else:
-            realized[key] = value
 
-    return realized or None
+    def __init__(self, template_extra):
+        # (key, value, parts): parts is the value split on {UUID}, or None
+        self._compiled = [
+            (
+                key,
+                value,
+                (
+                    value.split("{UUID}")
+                    if isinstance(value, str) and "{UUID}" in value
+                    else None
+                ),
+            )
+            for key, value in (template_extra or {}).items()
+        ]
+        self.uses_uuid = any(parts is not None for _, _, parts in self._compiled)
+
+    def render(self, uuid_value):
+        realized = {}
+        for key, value, parts in self._compiled:
+            if parts is None:
+                realized[key] = value
+            elif uuid_value:
+                realized[key] = uuid_value.join(parts)
+        return realized or None
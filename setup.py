@@ -56,6 +56,11 @@ setup(
         "configupdater>=3.2",
         "biomero-importer>=1.0.0",
     ],
+    extras_require={
+        # Faster JSON (de)serialization of large responses and faster
+        # Leica XML header parsing
+        "fast": ["orjson", "lxml"],
+    },
     python_requires=">=3.12",
     include_package_data=True,
     zip_safe=False,